@@ -0,0 +1,215 @@
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from generator import PlaylistGenerator
+
+# Job types: "generate" runs PlaylistGenerator.generate_playlist_from_seed, "convert" runs PlaylistConverter.convert_playlist
+JOB_TYPES = ("generate", "convert")
+
+# Jobs mostly wait on the APIs, whose shared schedulers pace them, so a handful of threads is enough
+DEFAULT_WORKERS = 4
+
+
+class BatchRunner:
+    """
+    Runs generate and convert jobs from a JSONL file concurrently, recording each result in a JSONL file.
+
+    Every job line is a JSON object with a "type" ("generate" or "convert"), an optional
+    "id", and the keyword arguments of PlaylistGenerator.generate_playlist_from_seed or
+    PlaylistConverter.convert_playlist. Jobs without an ID are identified by their line
+    number. All jobs share one generator (and through it one converter), so API clients,
+    rate-limit schedulers, search and ranking caches, and the feature store are shared.
+
+    Each result line holds the job's id, type, status ("ok" or "error"), the result URL or
+    the error message, and the seconds the job took. Results are appended and flushed as
+    jobs finish, so after an interruption the same command resumes: jobs that already
+    succeeded are skipped and failed or unfinished jobs run again.
+    """
+
+    def __init__(self, generator=None, workers=DEFAULT_WORKERS):
+        """
+        Initializes a new BatchRunner.
+
+        Args:
+            generator: The PlaylistGenerator to run jobs with; one is created if not given.
+            workers: The number of jobs run at once.
+        """
+        self._generator = generator or PlaylistGenerator()
+        self._converter = self._generator._converter
+        self._workers = workers
+
+    def run(self, jobs_file, results_file):
+        """
+        Runs every job in jobs_file that has not already succeeded according to results_file.
+
+        Args:
+            jobs_file: The path of the JSONL file of jobs.
+            results_file: The path of the JSONL file results are appended to.
+
+        Returns:
+            dict: The number of jobs that succeeded, failed, and were skipped, and the total seconds taken.
+        """
+        started = time.perf_counter()
+        done = completed_jobs(results_file)
+        all_jobs = read_jobs(jobs_file)
+        jobs = [job for job in all_jobs if job["id"] not in done]
+        summary = {"ok": 0, "error": 0, "skipped": len(all_jobs) - len(jobs), "seconds": 0.0}
+
+        with open(results_file, mode='a', encoding='utf-8') as output:
+            if _ends_mid_line(results_file):
+                # Close off a result cut short by an interruption so it does not run into the next one
+                output.write("\n")
+
+            def record(future):
+                result = future.result()
+                summary[result["status"]] += 1
+                # Results are only written from this thread, and each is on disk before the next
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                os.fsync(output.fileno())
+                print(f"[{result['status']}] {result['id']} ({result['seconds']:.1f}s)")
+
+            # At most one job per worker is submitted at a time, so an interruption never
+            # leaves queued jobs behind that would run without their results being recorded
+            pending = iter(jobs)
+            in_flight = set()
+            with ThreadPoolExecutor(max_workers=self._workers) as executor:
+                try:
+                    for job in itertools.islice(pending, self._workers):
+                        in_flight.add(executor.submit(self.run_job, job))
+                    while in_flight:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            record(future)
+                            job = next(pending, None)
+                            if job is not None:
+                                in_flight.add(executor.submit(self.run_job, job))
+                except BaseException:
+                    # Let the jobs already running finish and record them, then stop
+                    print(f"Interrupted; finishing {len(in_flight)} running jobs")
+                    for future in wait(in_flight).done:
+                        record(future)
+                    raise
+
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        return summary
+
+    def run_job(self, job):
+        """
+        Runs a single job, capturing its outcome and duration instead of raising.
+
+        Args:
+            job (dict): A job as returned by read_jobs.
+
+        Returns:
+            dict: The job's id, type, status, url or error, and seconds.
+        """
+        result = {"id": job["id"], "type": job.get("type")}
+        started = time.perf_counter()
+        try:
+            if "error" in job:
+                raise ValueError(job["error"])
+            if job.get("type") not in JOB_TYPES:
+                raise ValueError(f"Unsupported job type: {job.get('type')}")
+            arguments = {key: value for key, value in job.items() if key not in ("id", "type")}
+            if job.get("type") == "generate":
+                result["url"] = self._generator.generate_playlist_from_seed(**arguments)
+            else:
+                result["url"] = self._converter.convert_playlist(**arguments)
+            result["status"] = "ok"
+        except Exception as e:
+            result["status"] = "error"
+            result["error"] = str(e)
+        result["seconds"] = round(time.perf_counter() - started, 3)
+        return result
+
+
+def read_jobs(jobs_file):
+    """
+    Reads the jobs in a JSONL file, skipping blank lines.
+
+    Lines that are not JSON objects become jobs carrying an "error", so they are reported
+    in the results rather than stopping the batch.
+
+    Args:
+        jobs_file: The path of the JSONL file of jobs.
+
+    Returns:
+        list[dict]: The jobs in file order, each with an "id".
+    """
+    jobs = []
+    with open(jobs_file, mode='r', encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                job = json.loads(line)
+                if not isinstance(job, dict):
+                    raise ValueError("job is not a JSON object")
+            except ValueError as e:
+                job = {"error": f"Malformed job on line {line_number}: {e}"}
+            job["id"] = str(job.get("id", f"line-{line_number}"))
+            jobs.append(job)
+    return jobs
+
+
+def completed_jobs(results_file):
+    """
+    Collects the IDs of jobs that already succeeded according to a results file.
+
+    A partially written last line, left by an interruption, is ignored.
+
+    Args:
+        results_file: The path of the JSONL file of results; it may not exist yet.
+
+    Returns:
+        set: The IDs of succeeded jobs.
+    """
+    done = set()
+    if not os.path.isfile(results_file):
+        return done
+    with open(results_file, mode='r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("status") == "ok":
+                done.add(result["id"])
+    return done
+
+
+def _ends_mid_line(path):
+    """
+    Checks whether a non-empty file's last line is missing its newline.
+    """
+    with open(path, mode='rb') as file:
+        file.seek(0, os.SEEK_END)
+        if file.tell() == 0:
+            return False
+        file.seek(-1, os.SEEK_END)
+        return file.read(1) != b"\n"
+
+
+def main(argv=None):
+    """
+    Runs a batch of jobs from the command line (see BatchRunner).
+
+    Args:
+        argv: The command-line arguments, defaulting to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Run generate and convert jobs from a JSONL file.")
+    parser.add_argument("jobs_file", help="JSONL file with one job per line")
+    parser.add_argument("results_file", help="JSONL file results are appended to; rerun with the same file to resume")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of jobs run at once")
+    args = parser.parse_args(argv)
+
+    summary = BatchRunner(workers=args.workers).run(args.jobs_file, args.results_file)
+    print(f"{summary['ok']} succeeded, {summary['error']} failed, {summary['skipped']} skipped in {summary['seconds']:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from profiling import thread_name_prefix
+
+# Maximum number of items Spotify accepts in a single add-tracks request
+SPOTIFY_CHUNK_SIZE = 100
+# YouTube Music has no documented limit, but large single requests are rejected
+YOUTUBE_CHUNK_SIZE = 50
+
+
+class BulkWriteError(RuntimeError):
+    """
+    Raised when some items could not be added to a playlist after all retries.
+
+    Attributes:
+        written (int): The number of items that were added.
+        failed (list): The items that were not added, in order.
+        url (str): The URL of the playlist written to, if the caller knows it.
+    """
+
+    def __init__(self, message, written, failed, url=None):
+        super().__init__(message)
+        self.written = written
+        self.failed = failed
+        self.url = url
+
+
+class BulkPlaylistWriter:
+    """
+    Adds items to a playlist in API-sized chunks on a background thread.
+
+    Items are buffered as they arrive and every full chunk is handed to a single upload
+    thread, so uploads overlap with whatever work is still producing items (e.g. searches)
+    while chunks are still written in the order they were filled. A failing chunk can be
+    retried on its own with exponential backoff; if it keeps failing it is recorded, the
+    remaining chunks are still written, and close() raises a BulkWriteError listing the
+    failed items.
+
+    Attributes:
+        written (int): The number of items successfully added so far.
+        failed (list): Items from chunks that could not be added after all retries.
+    """
+
+    def __init__(self, add_chunk, chunk_size, max_retries=0, backoff=1.0, on_chunk=None, first_chunk_required=False):
+        """
+        Initializes a new BulkPlaylistWriter.
+
+        Args:
+            add_chunk: A callable that adds a list of items to the playlist and raises on failure.
+            chunk_size: The maximum number of items per call to add_chunk.
+            max_retries: How many times a failed chunk is retried before it is given up on. The
+                default is no retries, since calls made through a RequestScheduler are already
+                retried there (and only for retryable errors); set it for add_chunk callables
+                that are not scheduled.
+            backoff: The delay in seconds before the first retry, doubled on every retry.
+            on_chunk: An optional callable invoked on the upload thread after each chunk is
+                added, with the chunk's items and the running total of items written.
+            first_chunk_required: If True, nothing more is added once the first chunk has
+                failed (e.g. because adding the first chunk is what creates the playlist).
+        """
+        self._add_chunk = add_chunk
+        self._chunk_size = chunk_size
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._on_chunk = on_chunk
+        self._first_chunk_required = first_chunk_required
+        self._buffer = []
+        self._futures = []
+        # A single worker keeps chunks in submission order
+        self._uploader = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix("upload"))
+        self.written = 0
+        self.failed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Finish the chunks already submitted without masking the original error
+            self._finish()
+        return False
+
+    def add(self, item):
+        """
+        Buffers an item, submitting the buffer for upload once it reaches the chunk size.
+
+        Args:
+            item: The item (e.g. a track URI or video ID) to add to the playlist.
+        """
+        self._buffer.append(item)
+        if len(self._buffer) >= self._chunk_size:
+            self._submit()
+
+    def extend(self, items):
+        """
+        Buffers every item of an iterable, uploading chunks as they fill up.
+
+        Args:
+            items: An iterable of items to add to the playlist.
+        """
+        for item in items:
+            self.add(item)
+
+    def close(self):
+        """
+        Uploads any remaining buffered items and waits for all chunks to finish.
+
+        Returns:
+            int: The number of items successfully added.
+
+        Raises:
+            BulkWriteError: If any chunk could not be added after all retries.
+        """
+        self._finish()
+        if self.failed:
+            raise BulkWriteError(
+                f"Failed to add {len(self.failed)} of {self.written + len(self.failed)} items",
+                self.written, self.failed
+            )
+        return self.written
+
+    def _finish(self):
+        """
+        Submits any remaining buffered items and waits for every chunk to be uploaded.
+        """
+        if self._buffer:
+            self._submit()
+        for future in self._futures:
+            future.result()
+        self._uploader.shutdown(wait=True)
+
+    def _submit(self):
+        """
+        Hands the current buffer to the upload thread and starts a new buffer.
+        """
+        chunk, self._buffer = self._buffer, []
+        self._futures.append(self._uploader.submit(self._upload, chunk))
+
+    def _upload(self, chunk):
+        """
+        Adds a single chunk, retrying it with exponential backoff on failure.
+
+        Args:
+            chunk (list): The items to add.
+        """
+        if self._first_chunk_required and self.failed and not self.written:
+            self.failed.extend(chunk)
+            return
+
+        for attempt in range(self._max_retries + 1):
+            try:
+                self._add_chunk(chunk)
+                break
+            except Exception as e:
+                if attempt == self._max_retries:
+                    print(f"Failed to add {len(chunk)} tracks after {attempt + 1} attempts: {e}")
+                    self.failed.extend(chunk)
+                    return
+                time.sleep(self._backoff * (2 ** attempt))
+
+        self.written += len(chunk)
+        if self._on_chunk:
+            # The chunk is already added, so a failing callback must not cause it to be added again
+            try:
+                self._on_chunk(chunk, self.written)
+            except Exception as e:
+                print(f"Progress callback failed: {e}")
@@ -3,7 +3,22 @@ from spotipy.oauth2 import SpotifyOAuth
 from ytmusicapi import YTMusic
 import re
 import os
+import sys
+import requests
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from data_structures import LRUCache
+from scheduler import RetryableResponseError, ScheduledClient, get_scheduler, scheduled_call
+from sync_store import SyncStore, sync_key
+from profiling import thread_name_prefix
+from bulk_writer import BulkPlaylistWriter, BulkWriteError, SPOTIFY_CHUNK_SIZE, YOUTUBE_CHUNK_SIZE
+
+# Number of track searches kept in flight while a playlist is being written
+SEARCH_WORKERS = 8
+
+# Search results are cached per platform and query so repeated tracks are not searched again
+SEARCH_CACHE_SIZE = 10000
+SEARCH_CACHE_TTL = 24 * 60 * 60  # seconds
 
 class PlaylistConverter:
     """
@@ -16,14 +31,20 @@ class PlaylistConverter:
         """
         dotenv_path = os.path.join(os.path.dirname(__file__), 'config', '.env')
         load_dotenv(dotenv_path)
-        self._spotify = spotipy.Spotify(auth_manager=SpotifyOAuth(
+        spotify = spotipy.Spotify(auth_manager=SpotifyOAuth(
             client_id=os.getenv("SPOTIFY_CLIENT_ID"),
             client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
             redirect_uri="https://localhost:5173/callback",
             scope="playlist-read-private,playlist-read-collaborative,playlist-modify-private,playlist-modify-public",
-        ))
+        ), requests_session=requests.Session())
+        # All outbound calls go through the shared per-API schedulers. The plain session never
+        # retries, so every retry is left to the scheduler; spotipy's default retrying session
+        # would sleep through 429s itself and then raise them without their Retry-After.
+        self._spotify = ScheduledClient(spotify, get_scheduler("spotify"))
         self._spotify_username = os.getenv("SPOTIFY_USERNAME")
-        self._ytmusic = YTMusic("backend/config/browser.json")
+        self._ytmusic = ScheduledClient(YTMusic("backend/config/browser.json"), get_scheduler("youtube"))
+        self._search_cache = LRUCache(SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+        self._sync_store = SyncStore()
 
     def get_spotify_tracks(self, playlist_url):
         """
@@ -35,17 +56,32 @@ class PlaylistConverter:
         Returns:
             A list containing track names and artists.
         """
+        return [track_str for _, track_str in self._get_spotify_items(playlist_url)]
+
+    def _get_spotify_items(self, playlist_url):
+        """
+        Extracts the ID, name, and artist of every track in a Spotify playlist.
+
+        Args:
+            playlist_url: The URL of the Spotify playlist.
+
+        Returns:
+            A list of (track ID, "name artist") tuples. Tracks without an ID are keyed by their name and artist.
+        """
         playlist_id = re.search(r"playlist/([\w\d]+)", playlist_url).group(1)
         results = self._spotify.playlist_tracks(playlist_id)
         tracks = []  # Use a list instead of LinkedList
 
-        for item in results['items']:
-            track = item['track']
-            track_str = f"{track['name']} {track['artists'][0]['name']}"
-            tracks.append(track_str)  # Append each track to the list
+        # Follow pagination so playlists longer than one page are fully converted
+        while results:
+            for item in results['items']:
+                track = item['track']
+                track_str = f"{track['name']} {track['artists'][0]['name']}"
+                tracks.append((track['id'] or track_str, track_str))  # Append each track to the list
+            results = self._spotify.next(results) if results['next'] else None
 
         return tracks
-        
+
     def get_youtube_tracks(self, playlist_url):
         """
         Extracts track names and artists from a YouTube Music playlist and stores them in a list.
@@ -56,62 +92,320 @@ class PlaylistConverter:
         Returns:
             A list containing track names and artists.
         """
+        return [track_str for _, track_str in self._get_youtube_items(playlist_url)]
+
+    def _get_youtube_items(self, playlist_url):
+        """
+        Extracts the video ID, title, and artist of every track in a YouTube Music playlist.
+
+        Args:
+            playlist_url: The URL of the YouTube Music playlist.
+
+        Returns:
+            A list of (video ID, "title artist") tuples. Tracks without a video ID are keyed by their title and artist.
+        """
         playlist_id = re.search(r"list=([\w\d_-]+)", playlist_url).group(1)
-        playlist = self._ytmusic.get_playlist(playlist_id)
+        # Known limitation: ytmusicapi fetches every page of a long playlist inside this one
+        # call, so the scheduler paces (and retries) it as a single request
+        playlist = self._ytmusic.get_playlist(playlist_id, limit=None)
         tracks = []  # Use a list instead of LinkedList
 
         for track in playlist["tracks"]:
             track_str = f"{track['title']} {track['artists'][0]['name']}"
-            tracks.append(track_str)  # Append each track to the list
+            tracks.append((track.get('videoId') or track_str, track_str))  # Append each track to the list
 
         return tracks
 
-    def create_youtube_playlist(self, playlist_name, tracks):
+    def search_youtube(self, track):
         """
-        Searches YouTube Music for tracks and creates a playlist with the given tracks.
+        Searches YouTube Music for a single track.
+
+        Args:
+            track: A string containing the track name and artist.
+
+        Returns:
+            The video ID of the best match, or None if no match was found or the search failed.
+        """
+        try:
+            return self._find_youtube(track)
+        except Exception as e:
+            print(f"Error searching for {track}: {e}")
+        return None
+
+    def _find_youtube(self, track):
+        """
+        Searches YouTube Music for a single track, raising if the search itself fails.
+
+        Args:
+            track: A string containing the track name and artist.
+
+        Returns:
+            The video ID of the best match, or None if the search returned no results.
+        """
+        video_id = self._search_cache.get(("youtube", track))
+        if video_id is not None:
+            return video_id
+
+        search_results = self._ytmusic.search(query=track, filter="songs", limit=1)
+        if search_results:
+            video_id = search_results[0]["videoId"]
+            self._search_cache.put(("youtube", track), video_id)
+            return video_id
+        print(f"No results found for {track}")
+        return None
+
+    def search_spotify(self, track):
+        """
+        Searches Spotify for a single track.
+
+        Args:
+            track: A string containing the track name and artist.
+
+        Returns:
+            The URI of the best match, or None if no match was found.
+        """
+        match = self.search_spotify_track(track)
+        return match["uri"] if match else None
+
+    def search_spotify_track(self, track):
+        """
+        Searches Spotify for a single track, returning the matched track itself.
+
+        The match is trimmed to the fields the generator scores and writes with, and it is
+        cached so search_spotify and search_spotify_track share results.
+
+        Args:
+            track: A string containing the track name and artist.
+
+        Returns:
+            A dict with the id, uri, name, artists (each with id and name), and album (with id)
+            of the best match, or None if no match was found.
+        """
+        match = self._search_cache.get(("spotify", track))
+        if match is not None:
+            return match
+
+        result = self._spotify.search(q=track, type="track", limit=1)
+        if result["tracks"]["items"]:
+            item = result["tracks"]["items"][0]
+            match = {
+                "id": item["id"],
+                "uri": item["uri"],
+                "name": item["name"],
+                "artists": [{"id": artist.get("id"), "name": artist["name"]} for artist in item["artists"]],
+                "album": {"id": (item.get("album") or {}).get("id")},
+            }
+            self._search_cache.put(("spotify", track), match)
+            return match
+        print(f"No results found for {track}")
+        return None
+
+    def _resolve_all(self, tracks, search, progress=None):
+        """
+        Searches for tracks concurrently, yielding each result in the original track order.
+
+        Args:
+            tracks: A list containing the track names and artists.
+            search: The per-track search method (search_spotify or search_youtube).
+            progress: An optional progress callback (see convert_playlist), told about each match or miss.
+
+        Yields:
+            The identifier of each track's match, or None where no match was found.
+        """
+        with ThreadPoolExecutor(max_workers=SEARCH_WORKERS, thread_name_prefix=thread_name_prefix("search")) as pool:
+            for track, match in zip(tracks, pool.map(search, tracks)):
+                report_progress(progress, "match" if match else "miss", track=track)
+                yield match
+
+    def _search_all(self, tracks, search, progress=None):
+        """
+        Searches for tracks concurrently, yielding matches in the original track order.
+
+        Matches are yielded as soon as they (and every track before them) are resolved, so a
+        consumer can start writing while later searches are still in flight.
 
         Args:
-            playlist_name: The name of the new YouTube playlist.
             tracks: A list containing the track names and artists.
+            search: The per-track search method (search_spotify or search_youtube).
+            progress: An optional progress callback (see convert_playlist), told about each match or miss.
+
+        Yields:
+            The identifier of each track that was found.
+        """
+        for match in self._resolve_all(tracks, search, progress):
+            if match:
+                yield match
+
+    def add_spotify_tracks(self, playlist_id, tracks, progress=None):
+        """
+        Adds tracks to a Spotify playlist in chunks of at most 100, preserving their order.
+
+        Args:
+            playlist_id: The ID of the Spotify playlist to add to.
+            tracks: An iterable of track IDs or URIs.
+            progress: An optional progress callback (see convert_playlist), told about each batch added.
 
         Returns:
-            A string URL of the newly created YouTube Music playlist, or None if the playlist creation fails.
+            int: The number of tracks that were added.
+
+        Raises:
+            BulkWriteError: If some tracks could not be added.
         """
-        video_ids = []
+        def add_chunk(chunk):
+            self._spotify.user_playlist_add_tracks(
+                user=self._spotify_username,
+                playlist_id=playlist_id,
+                tracks=chunk
+            )
 
-        while tracks:
-            track = tracks.pop(0)  # Pop the first track from the list
-            try:
-                search_results = self._ytmusic.search(query=track, filter="songs", limit=1)
-                if search_results:
-                    video_id = search_results[0]["videoId"]
-                    video_ids.append(video_id)
-                else:
-                    print(f"No results found for {track}")
-            except Exception as e:
-                print(f"Error searching for {track}: {e}")
+        with BulkPlaylistWriter(add_chunk, SPOTIFY_CHUNK_SIZE, on_chunk=_batch_reporter(progress)) as writer:
+            writer.extend(tracks)
+        return writer.written
+
+    def write_youtube_playlist(self, playlist_name, video_ids, description="Converted from Spotify", progress=None):
+        """
+        Creates a YouTube Music playlist and adds videos to it in chunks, preserving their order.
+
+        The playlist is created together with the first chunk, so nothing is created if there
+        are no videos to add. If creating it fails, no further chunks are written. A creation
+        or add that YouTube reports as failed is retried like any transient API error.
+
+        Args:
+            playlist_name: The name of the new YouTube playlist.
+            video_ids: An iterable of YouTube video IDs.
+            description: The description of the new playlist.
+            progress: An optional progress callback (see convert_playlist), told about each batch added.
+
+        Returns:
+            A string URL of the newly created YouTube Music playlist, or None if there were no videos to add.
+
+        Raises:
+            BulkWriteError: If the playlist could not be created or some videos could not be added.
+        """
+        playlist_id = None
 
-        if video_ids:
-            playlist_id = self._ytmusic.create_playlist(
+        def create(ytmusic, chunk):
+            response = ytmusic.create_playlist(
                 title=playlist_name,
-                description="Converted from Spotify",
-                video_ids=video_ids,
+                description=description,
+                video_ids=chunk,
                 privacy_status="PUBLIC"
             )
+            if not isinstance(response, str):
+                raise RetryableResponseError(f"Playlist creation failed: {response}")
+            return response
+
+        def add_chunk(chunk):
+            nonlocal playlist_id
+            if playlist_id is not None:
+                self._add_youtube_chunk(playlist_id, chunk)
+            else:
+                playlist_id = scheduled_call(self._ytmusic, create, chunk)
+
+        try:
+            with BulkPlaylistWriter(add_chunk, YOUTUBE_CHUNK_SIZE, on_chunk=_batch_reporter(progress),
+                                    first_chunk_required=True) as writer:
+                writer.extend(video_ids)
+        except BulkWriteError as e:
+            if playlist_id is None:
+                raise BulkWriteError("YouTube playlist creation failed", e.written, e.failed) from e
+            url = f"https://music.youtube.com/playlist?list={playlist_id}"
+            raise BulkWriteError(f"{e} to {url}", e.written, e.failed, url) from e
+
+        if playlist_id:
             return f"https://music.youtube.com/playlist?list={playlist_id}"
 
         return None
 
-    def create_spotify_playlist(self, playlist_name, tracks):
+    def add_youtube_tracks(self, playlist_id, video_ids, progress=None):
+        """
+        Adds videos to an existing YouTube Music playlist in chunks, preserving their order.
+
+        Args:
+            playlist_id: The ID of the YouTube Music playlist to add to.
+            video_ids: An iterable of YouTube video IDs.
+            progress: An optional progress callback (see convert_playlist), told about each batch added.
+
+        Returns:
+            int: The number of videos that were added.
+
+        Raises:
+            BulkWriteError: If some videos could not be added.
+        """
+        with BulkPlaylistWriter(lambda chunk: self._add_youtube_chunk(playlist_id, chunk), YOUTUBE_CHUNK_SIZE,
+                                on_chunk=_batch_reporter(progress)) as writer:
+            writer.extend(video_ids)
+        return writer.written
+
+    def _add_youtube_chunk(self, playlist_id, video_ids):
+        """
+        Adds one chunk of videos to a YouTube Music playlist, retrying it (as one scheduled call)
+        while YouTube reports a failure and raising once retries run out.
+        """
+        def add(ytmusic):
+            response = ytmusic.add_playlist_items(playlist_id, videoIds=video_ids, duplicates=True)
+            if "SUCCEEDED" not in response.get("status", ""):
+                raise RetryableResponseError(f"Adding tracks failed: {response}")
+
+        scheduled_call(self._ytmusic, add)
+
+    def _remove_spotify_tracks(self, playlist_id, uris):
+        """
+        Removes every occurrence of the given tracks from a Spotify playlist, in chunks of at most 100.
+        """
+        def remove_chunk(chunk):
+            self._spotify.playlist_remove_all_occurrences_of_items(playlist_id, chunk)
+
+        with BulkPlaylistWriter(remove_chunk, SPOTIFY_CHUNK_SIZE) as writer:
+            writer.extend(uris)
+
+    def _remove_youtube_tracks(self, playlist_id, video_ids):
+        """
+        Removes every occurrence of the given videos from a YouTube Music playlist.
+
+        YouTube removes playlist entries by their setVideoId, so the target playlist is read
+        once to look those up.
+        """
+        video_ids = set(video_ids)
+        # One scheduled call that fetches every page, as in _get_youtube_items
+        playlist = self._ytmusic.get_playlist(playlist_id, limit=None)
+        entries = [track for track in playlist["tracks"] if track.get("videoId") in video_ids and track.get("setVideoId")]
+
+        with BulkPlaylistWriter(lambda chunk: self._ytmusic.remove_playlist_items(playlist_id, chunk), YOUTUBE_CHUNK_SIZE) as writer:
+            writer.extend(entries)
+
+    def create_youtube_playlist(self, playlist_name, tracks, progress=None):
+        """
+        Searches YouTube Music for tracks and creates a playlist with the given tracks.
+
+        Args:
+            playlist_name: The name of the new YouTube playlist.
+            tracks: A list containing the track names and artists.
+            progress: An optional progress callback (see convert_playlist).
+
+        Returns:
+            A string URL of the newly created YouTube Music playlist, or None if no tracks were found.
+
+        Raises:
+            BulkWriteError: If the playlist could not be created or some tracks could not be added.
+        """
+        video_ids = self._search_all(tracks, self.search_youtube, progress)
+        return self.write_youtube_playlist(playlist_name, video_ids, progress=progress)
+
+    def create_spotify_playlist(self, playlist_name, tracks, progress=None):
         """
         Searches Spotify for tracks and creates a playlist with the given tracks.
 
         Args:
             playlist_name: The name of the new Spotify playlist.
             tracks: A list containing the track names and artists.
+            progress: An optional progress callback (see convert_playlist).
 
         Returns:
             A string URL of the newly created Spotify playlist.
+
+        Raises:
+            BulkWriteError: If some tracks could not be added.
         """
         playlist = self._spotify.user_playlist_create(
             user=self._spotify_username,
@@ -119,47 +413,219 @@ class PlaylistConverter:
             public=True
         )
 
-        spotify_uris = []
+        uris = self._search_all(tracks, self.search_spotify, progress)
+        try:
+            self.add_spotify_tracks(playlist["id"], uris, progress)
+        except BulkWriteError as e:
+            url = playlist["external_urls"]["spotify"]
+            raise BulkWriteError(f"{e} to {url}", e.written, e.failed, url) from e
 
-        while tracks:
-            track = tracks.pop(0)  # Pop the first track from the list
-            result = self._spotify.search(q=track, type="track", limit=1)
-            if result["tracks"]["items"]:
-                spotify_uris.append(result["tracks"]["items"][0]["uri"])
-            else:
-                print(f"No results found for {track}")
+        return playlist["external_urls"]["spotify"]
 
-        self._spotify.user_playlist_add_tracks(
-            user=self._spotify_username,
-            playlist_id=playlist["id"],
-            tracks=spotify_uris
-        )
+    def sync_playlist(self, source_url, target_platform, progress=None):
+        """
+        Brings a playlist's conversion up to date, converting it for the first time if needed.
 
-        return playlist["external_urls"]["spotify"]
+        The target playlist, the source tracks, and each source track's match on the target
+        platform are remembered between runs. A re-sync compares the source's current tracks
+        with the last sync and only searches for tracks that were added, then adds and removes
+        just the changed tracks on the target playlist, so its cost grows with the number of
+        changes rather than the playlist's length. Added tracks are appended to the end of the
+        target playlist. Tracks that found no match are not searched again, but searches and
+        writes that failed are retried by the next sync.
 
-    def convert_playlist(self, source_url, target_platform):
+        Args:
+            source_url: The URL of the source playlist (either from Spotify or YouTube Music).
+            target_platform: The platform to sync the playlist to ("spotify" or "youtube").
+            progress: An optional progress callback (see convert_playlist), which is also told
+                "removed" with the number of tracks removed.
+
+        Returns:
+            A string URL of the target playlist or an error message if the sync is not supported.
+
+        Raises:
+            BulkWriteError: If the target playlist could not be created, or if some searches or
+                writes failed. In the latter case the sync's progress is still saved first.
+        """
+        if "spotify.com" in source_url and target_platform == "youtube":
+            key = sync_key("spotify", re.search(r"playlist/([\w\d]+)", source_url).group(1), target_platform)
+            items = self._get_spotify_items(source_url)
+            search = self._find_youtube
+        elif "youtube.com" in source_url and target_platform == "spotify":
+            key = sync_key("youtube", re.search(r"list=([\w\d_-]+)", source_url).group(1), target_platform)
+            items = self._get_youtube_items(source_url)
+            search = self.search_spotify
+        else:
+            return "Invalid input or unsupported platform."
+        report_progress(progress, "tracks_fetched", count=len(items))
+
+        # Concurrent syncs of the same playlist (in any process) take turns
+        with self._sync_store.lock(key):
+            return self._sync_locked(key, items, search, target_platform, progress)
+
+    def _sync_locked(self, key, items, search, target_platform, progress=None):
+        """
+        Syncs a playlist's tracks to its target playlist while holding the sync key's lock (see sync_playlist).
+
+        Args:
+            key: The sync key (see sync_key).
+            items: The (source ID, "name artist") tuples of the source playlist's current tracks.
+            search: The per-track search on the target platform, raising if a search fails.
+            target_platform: The platform to sync the playlist to ("spotify" or "youtube").
+            progress: An optional progress callback (see sync_playlist).
+
+        Returns:
+            A string URL of the target playlist.
+        """
+        state = self._sync_store.get(key) or {"target_id": None, "target_url": None, "tracks": [], "resolutions": {}}
+        resolutions = state["resolutions"]
+        current = [source_id for source_id, _ in items]
+        previous = set(state["tracks"])
+        added = {source_id: track_str for source_id, track_str in items if source_id not in previous}
+
+        # Only tracks that have never been searched for cost a search. A search that fails
+        # (rather than finding nothing) is not remembered, so the next sync tries it again.
+        failed_searches = set()
+
+        def attempt(track_str):
+            try:
+                return search(track_str)
+            except Exception as e:
+                print(f"Error searching for {track_str}: {e}")
+                failed_searches.add(track_str)
+                return None
+
+        unresolved = [source_id for source_id in added if source_id not in resolutions]
+        queries = [added[source_id] for source_id in unresolved]
+        for source_id, match in zip(unresolved, self._resolve_all(queries, attempt, progress)):
+            if added[source_id] not in failed_searches:
+                resolutions[source_id] = match
+
+        # A target track is only removed if no remaining source track resolves to it
+        kept = {resolutions.get(source_id) for source_id in current}
+        to_add = [resolutions[source_id] for source_id in added if resolutions.get(source_id)]
+        to_remove = list(dict.fromkeys(
+            resolutions[source_id] for source_id in previous - set(current)
+            if resolutions.get(source_id) and resolutions[source_id] not in kept
+        ))
+
+        # Writes that fail are left out of the stored state so the next sync retries them
+        failed_adds = []
+        failed_removals = []
+        target_id, target_url = state["target_id"], state["target_url"]
+        if target_platform == "spotify":
+            if target_id is None:
+                playlist = self._spotify.user_playlist_create(user=self._spotify_username, name="Converted Playlist", public=True)
+                target_id, target_url = playlist["id"], playlist["external_urls"]["spotify"]
+            try:
+                self.add_spotify_tracks(target_id, to_add, progress)
+            except BulkWriteError as e:
+                failed_adds.extend(e.failed)
+            try:
+                self._remove_spotify_tracks(target_id, to_remove)
+            except BulkWriteError as e:
+                failed_removals.extend(e.failed)
+        elif target_id is None:
+            try:
+                target_url = self.write_youtube_playlist("Converted Playlist", to_add, progress=progress)
+            except BulkWriteError as e:
+                if e.url is None:
+                    # Creation failed; leave the state alone so the next sync tries again
+                    raise
+                target_url = e.url
+                failed_adds.extend(e.failed)
+            target_id = re.search(r"list=([\w\d_-]+)", target_url).group(1) if target_url else None
+        else:
+            try:
+                self.add_youtube_tracks(target_id, to_add, progress)
+            except BulkWriteError as e:
+                failed_adds.extend(e.failed)
+            try:
+                self._remove_youtube_tracks(target_id, to_remove)
+            except BulkWriteError as e:
+                failed_removals.extend(entry["videoId"] for entry in e.failed)
+        if len(to_remove) > len(failed_removals):
+            report_progress(progress, "removed", count=len(to_remove) - len(failed_removals))
+
+        # Tracks whose search or add failed are stored as not yet synced, and tracks whose
+        # removal failed are stored as still present, so the next sync picks both up again
+        current_ids = set(current)
+        tracks = [
+            source_id for source_id in current
+            if source_id not in added or (source_id in resolutions and resolutions[source_id] not in failed_adds)
+        ]
+        tracks += [
+            source_id for source_id in state["tracks"]
+            if source_id not in current_ids and resolutions.get(source_id) in failed_removals
+        ]
+        self._sync_store.put(key, {
+            "target_id": target_id,
+            "target_url": target_url,
+            "tracks": tracks,
+            "resolutions": {source_id: resolutions[source_id] for source_id in set(tracks) | current_ids if source_id in resolutions},
+        })
+
+        if failed_searches or failed_adds or failed_removals:
+            raise BulkWriteError(
+                f"Sync of {target_url} incomplete: {len(failed_searches)} searches, {len(failed_adds)} adds, "
+                f"and {len(failed_removals)} removals failed; the next sync retries them",
+                len(to_add) - len(failed_adds), failed_adds, target_url
+            )
+        return target_url
+
+    def convert_playlist(self, source_url, target_platform, progress=None, sync=False):
         """
         Converts a playlist between Spotify and YouTube Music.
 
+        If a progress callback is given, it is called as progress(event, data) as the conversion
+        advances: "tracks_fetched" with the source track count, "match" or "miss" with each
+        searched track, and "batch_added" with the size of each batch written and the running
+        total. Batch events are reported from the upload thread.
+
         Args:
             source_url: The URL of the source playlist (either from Spotify or YouTube Music).
             target_platform: The platform to convert the playlist to ("spotify" or "youtube").
+            progress: An optional callable taking an event name and a dict of event data.
+            sync: If True, update the playlist's previous conversion instead of creating a new
+                playlist (see sync_playlist).
 
         Returns:
             A string URL of the converted playlist or an error message if the conversion fails.
         """
+        if sync:
+            return self.sync_playlist(source_url, target_platform, progress)
+
         if "spotify.com" in source_url:
             tracks = self.get_spotify_tracks(source_url)
+            report_progress(progress, "tracks_fetched", count=len(tracks))
             if target_platform == "youtube":
-                return self.create_youtube_playlist("Converted Playlist", tracks)
+                return self.create_youtube_playlist("Converted Playlist", tracks, progress)
         elif "youtube.com" in source_url:
             tracks = self.get_youtube_tracks(source_url)
+            report_progress(progress, "tracks_fetched", count=len(tracks))
             if target_platform == "spotify":
-                return self.create_spotify_playlist("Converted Playlist", tracks)
+                return self.create_spotify_playlist("Converted Playlist", tracks, progress)
 
         return "Invalid input or unsupported platform."
 
 
+def report_progress(progress, event, **data):
+    """
+    Calls a progress callback with an event and its data, if a callback was given.
+    """
+    if progress:
+        progress(event, data)
+
+
+def _batch_reporter(progress):
+    """
+    Adapts a progress callback into a BulkPlaylistWriter on_chunk hook that reports "batch_added".
+    """
+    if not progress:
+        return None
+    return lambda chunk, total: progress("batch_added", {"count": len(chunk), "total": total})
+
+
 # Function to validate and handle user input
 def get_valid_url(prompt, valid_platforms):
     """
@@ -186,6 +652,12 @@ def get_valid_platform(prompt, valid_platforms):
 
 
 if __name__ == "__main__":
+    # Non-interactive mode: python converter.py --batch jobs.jsonl results.jsonl [--workers N]
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        from batch import main
+        main(sys.argv[2:])
+        sys.exit()
+
     # Define valid platforms
     valid_platforms = ["spotify", "youtube"]
 
@@ -2,5 +2,6 @@ from .linked_list import LinkedList
 from .priority_queue import PriorityQueue
 from .heap import Heap
 from .graph import Graph
+from .lru_cache import LRUCache
 
-__all__ = ["Heap", "LinkedList", "PriorityQueue", "Graph"]
\ No newline at end of file
+__all__ = ["Heap", "LinkedList", "PriorityQueue", "Graph", "LRUCache"]
\ No newline at end of file
@@ -1,10 +1,11 @@
 class Node:
     """
-    A generic node class for a linked list
+    A generic node class for a doubly linked list
 
     Attributes:
         value: The value of the node
         next: The next node in the linked list
+        prev: The previous node in the linked list
     """
 
     def __init__(self, value):
@@ -17,14 +18,16 @@ class Node:
 
         self.value = value
         self.next = None
+        self.prev = None
 
 
 class LinkedList:
     """
-    A generic linked list class
+    A generic doubly linked list class
 
     Attributes:
         head: The first node in the linked list
+        tail: The last node in the linked list
     """
 
 
@@ -34,35 +37,106 @@ class LinkedList:
         """
 
         self.head = None
-    
+        self.tail = None
+        self._size = 0
+
+    def __len__(self):
+        """
+        Returns the number of nodes in the linked list
+        """
+
+        return self._size
+
+    def __iter__(self):
+        """
+        Iterates over the values of the linked list from head to tail
+        """
+
+        current = self.head
+        while current:
+            yield current.value
+            current = current.next
+
     def append(self, value):
         """
         Appends a new node with a given value to the end of the linked list
 
         Args:
             value: The value for the new node
+
+        Returns:
+            The new node
         """
 
         new_node = Node(value)
-        if self.head is None:
+        if self.tail is None:
             self.head = new_node
-        current = self.head
-        while current.next:
-            current = current.next
-        current.next = new_node
-    
+        else:
+            new_node.prev = self.tail
+            self.tail.next = new_node
+        self.tail = new_node
+        self._size += 1
+        return new_node
+
     def append_to_front(self, value):
         """
         Appends a new node with a given value to the front of the linked list
 
         Args:
             value: The value for the new node
+
+        Returns:
+            The new node
         """
 
         new_node = Node(value)
         new_node.next = self.head
+        if self.head is None:
+            self.tail = new_node
+        else:
+            self.head.prev = new_node
         self.head = new_node
-    
+        self._size += 1
+        return new_node
+
+    def unlink(self, node):
+        """
+        Removes a node from the linked list in constant time
+
+        Args:
+            node: A node that belongs to this linked list
+        """
+
+        if node.prev is None:
+            self.head = node.next
+        else:
+            node.prev.next = node.next
+
+        if node.next is None:
+            self.tail = node.prev
+        else:
+            node.next.prev = node.prev
+
+        node.next = None
+        node.prev = None
+        self._size -= 1
+
+    def move_to_end(self, node):
+        """
+        Moves a node to the end of the linked list in constant time
+
+        Args:
+            node: A node that belongs to this linked list
+        """
+
+        if node is self.tail:
+            return
+        self.unlink(node)
+        node.prev = self.tail
+        self.tail.next = node
+        self.tail = node
+        self._size += 1
+
     def delete(self, value):
         """
         Deletes the first instance of a node with a given value from the linked list
@@ -71,33 +145,32 @@ class LinkedList:
             value: The value of the node to delete
         """
 
-        if self.head is None:
-            return
-        
-        if self.head.value == value:
-            self.head = self.head.next
-            return
-        
-        current = self.head
+        node = self.find(value)
+        if node is not None:
+            self.unlink(node)
 
-        while current.next:
-            if current.next.value == value:
-                current.next = current.next.next
-                return
-            
-            current = current.next
-    
     def pop(self):
         """
         Removes and returns the first node (head) of the linked list
         """
         if self.head is None:
-            return None 
-        
+            return None
+
         popped_value = self.head.value
-        self.head = self.head.next 
+        self.unlink(self.head)
+        return popped_value
+
+    def pop_back(self):
+        """
+        Removes and returns the last node (tail) of the linked list
+        """
+        if self.tail is None:
+            return None
+
+        popped_value = self.tail.value
+        self.unlink(self.tail)
         return popped_value
-        
+
     def find(self, value):
         """
         Returns the first node with a given value
@@ -115,7 +188,7 @@ class LinkedList:
                 return current
             current = current.next
         return None
-    
+
     def print_list(self):
         """
         Prints the linked list
@@ -126,4 +199,3 @@ class LinkedList:
             print(current.value, end=" -> ")
             current = current.next
         print("None")
-
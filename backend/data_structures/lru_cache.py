@@ -0,0 +1,149 @@
+import threading
+import time
+
+from .linked_list import LinkedList
+
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache with an optional time to live.
+
+    Entries are kept in a doubly linked list ordered from least to most recently used, with a
+    dictionary from key to list node, so lookups, insertions, and evictions are all O(1).
+
+    Attributes:
+        hits (int): The number of lookups that found a live entry.
+        misses (int): The number of lookups that found no entry or an expired one.
+        evictions (int): The number of entries removed to stay within max_size.
+    """
+
+    def __init__(self, max_size, ttl=None):
+        """
+        Initializes a new instance of the LRUCache class.
+
+        Args:
+            max_size (int): The maximum number of entries; the least recently used is evicted first.
+            ttl (float, optional): The number of seconds an entry stays valid. Defaults to None (no expiry).
+
+        Raises:
+            ValueError: If max_size is less than 1.
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1.")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._order = LinkedList()
+        self._nodes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        """
+        Returns the number of entries in the cache, including any that have expired but not yet been removed.
+        """
+        return len(self._nodes)
+
+    def __contains__(self, key):
+        """
+        Checks whether a live entry exists for a key without counting it as a use.
+        """
+        with self._lock:
+            node = self._nodes.get(key)
+            return node is not None and not self._expired(node)
+
+    def get(self, key, default=None):
+        """
+        Returns the value stored for a key and marks it as most recently used.
+
+        Args:
+            key: The key to look up.
+            default: The value returned if the key is missing or expired. Defaults to None.
+
+        Returns:
+            Any: The cached value, or default.
+        """
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is None or self._expired(node):
+                if node is not None:
+                    self._remove(node)
+                self.misses += 1
+                return default
+
+            self._order.move_to_end(node)
+            self.hits += 1
+            return node.value[1]
+
+    def put(self, key, value):
+        """
+        Stores a value for a key, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to store.
+        """
+        expires_at = None if self._ttl is None else time.monotonic() + self._ttl
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                node.value = (key, value, expires_at)
+                self._order.move_to_end(node)
+            else:
+                self._nodes[key] = self._order.append((key, value, expires_at))
+
+            while len(self._nodes) > self._max_size:
+                self._remove(self._order.head)
+                self.evictions += 1
+
+    def delete(self, key):
+        """
+        Removes the entry for a key, if there is one.
+
+        Args:
+            key: The key to remove.
+        """
+        with self._lock:
+            node = self._nodes.get(key)
+            if node is not None:
+                self._remove(node)
+
+    def clear(self):
+        """
+        Removes every entry from the cache. Statistics are kept.
+        """
+        with self._lock:
+            self._order = LinkedList()
+            self._nodes = {}
+
+    def stats(self):
+        """
+        Returns the cache's usage statistics.
+
+        Returns:
+            dict: The current size, max size, hits, misses, and evictions.
+        """
+        with self._lock:
+            return {
+                "size": len(self._nodes),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _expired(self, node):
+        """
+        Checks whether a node's entry has passed its expiry time.
+        """
+        expires_at = node.value[2]
+        return expires_at is not None and expires_at <= time.monotonic()
+
+    def _remove(self, node):
+        """
+        Removes a node from both the recency list and the key lookup.
+        """
+        self._order.unlink(node)
+        del self._nodes[node.value[0]]
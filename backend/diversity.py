@@ -0,0 +1,76 @@
+import numpy as np
+
+
+def mmr_select(features, scores, amount, diversity=0.0, artists=None, max_per_artist=None):
+    """
+    Selects tracks by maximal marginal relevance, trading closeness to the mood targets for variety.
+
+    At each step the candidate maximizing (1 - diversity) * relevance - diversity * redundancy
+    is taken, where relevance is the candidate's normalized match to the targets and
+    redundancy is its highest similarity to any track already selected. Redundancy is kept
+    as a running maximum that is updated against only the newest selection, so every step is
+    a single vectorized pass over the candidates and the whole selection costs
+    O(amount * candidates) rather than a pairwise loop.
+
+    Args:
+        features (numpy.ndarray): A (candidates, features) matrix of audio features.
+        scores (numpy.ndarray): Each candidate's score from score_features (lower is a better match).
+        amount: The maximum number of tracks to select.
+        diversity: The weight of redundancy from 0 (pure relevance) to 1 (pure variety).
+        artists (sequence, optional): An artist label per candidate, required for max_per_artist.
+        max_per_artist (int, optional): The most tracks any one artist may contribute.
+
+    Returns:
+        numpy.ndarray: Indices into the candidates, in selection order.
+
+    Raises:
+        ValueError: If diversity is outside 0 to 1, or max_per_artist is given without artists.
+    """
+    if not 0 <= diversity <= 1:
+        raise ValueError("diversity must be between 0 and 1.")
+    if max_per_artist is not None and artists is None:
+        raise ValueError("artists are required to cap tracks per artist.")
+
+    scores = np.asarray(scores, dtype=np.float64)
+    count = scores.size
+    amount = min(amount, count)
+    if amount <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Standardize each feature so loudness (in dB) does not outweigh the 0 to 1 features
+    features = np.asarray(features, dtype=np.float64)
+    spread = features.std(axis=0)
+    spread[spread == 0] = 1
+    features = (features - features.mean(axis=0)) / spread
+
+    # Map scores onto 0 (worst) to 1 (best) so relevance and redundancy share a scale
+    score_range = scores.max() - scores.min()
+    relevance = (scores.max() - scores) / score_range if score_range > 0 else np.ones(count)
+
+    if max_per_artist is not None:
+        _, artist_codes = np.unique(np.asarray(artists), return_inverse=True)
+        artist_counts = np.zeros(artist_codes.max() + 1, dtype=np.int64)
+
+    redundancy = np.zeros(count)
+    available = np.ones(count, dtype=bool)
+    selected = []
+
+    while len(selected) < amount and available.any():
+        objective = (1 - diversity) * relevance - diversity * redundancy
+        objective[~available] = -np.inf
+        choice = int(np.argmax(objective))
+        selected.append(choice)
+        available[choice] = False
+
+        if diversity > 0:
+            # Similarity decays with distance in standardized feature space
+            distance = np.sqrt(((features - features[choice]) ** 2).sum(axis=1))
+            np.maximum(redundancy, 1 / (1 + distance), out=redundancy)
+
+        if max_per_artist is not None:
+            artist = artist_codes[choice]
+            artist_counts[artist] += 1
+            if artist_counts[artist] >= max_per_artist:
+                available[artist_codes == artist] = False
+
+    return np.array(selected, dtype=np.int64)
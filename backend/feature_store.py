@@ -0,0 +1,618 @@
+import contextlib
+import csv
+import io
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where builds are not coordinated between processes
+    fcntl = None
+
+# Audio feature columns kept in the store, in column order
+FEATURE_COLUMNS = ("energy", "valence", "danceability", "loudness")
+
+# Link to Kaggle Dataset CSV: https://www.kaggle.com/datasets/rodolfofigueroa/spotify-12m-songs?resource=download)
+DEFAULT_CSV = os.path.join(os.path.dirname(__file__), "tracks_features.csv")
+
+# Directory holding the built store as .npy files that every worker process memory-maps
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "feature_cache")
+
+# The CSV is parsed in about this many byte ranges per worker process, so that uneven
+# ranges balance out, but never in ranges smaller than MIN_CHUNK_BYTES
+CHUNKS_PER_WORKER = 4
+MIN_CHUNK_BYTES = 1 << 20
+
+# Spotify IDs are 22 base62 characters; used to pull IDs out of the stringified lists in the CSV
+_SPOTIFY_ID = re.compile(r"[0-9A-Za-z]{22}")
+
+# A Spotify ID encodes a 128-bit integer in base62 using this alphabet. IDs are stored as that
+# integer in 16 big-endian bytes, so byte order matches numeric order for binary search.
+_BASE62 = b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+_ID_LENGTH = 22
+_ID_DTYPE = "S16"
+_DIGITS = np.full(256, 255, dtype=np.uint8)
+_DIGITS[np.frombuffer(_BASE62, dtype=np.uint8)] = np.arange(62, dtype=np.uint8)
+_ALPHABET = np.frombuffer(_BASE62, dtype=np.uint8)
+
+# Features are quantized to 16 bits between each column's minimum and maximum
+_QUANTIZED_DTYPE = np.uint16
+_QUANTIZED_LEVELS = np.iinfo(_QUANTIZED_DTYPE).max
+
+# Arrays making up a store, saved as <name>.npy in the cache directory
+_ARRAYS = (
+    "ids", "quantized_features", "feature_scale", "primary_artists",
+    "artist_keys", "artist_offsets", "artist_rows",
+    "album_keys", "album_offsets", "album_rows",
+)
+
+
+class FeatureStore:
+    """
+    A read-only store of the audio features in the tracks CSV, kept entirely in compact flat arrays.
+
+    Track IDs are packed into 16-byte integers and rows are sorted by them, so a track's row
+    is found by binary search over the ID array. Each feature is quantized to 16 bits between
+    its column's minimum and maximum, which keeps it within half a quantization step, that is
+    (maximum - minimum) / 131070, of its exact value (under 1e-5 for the 0 to 1 features).
+    Artist and album IDs map to the rows of their tracks through inverted indexes stored in
+    compressed sparse row form (sorted keys, offsets, rows), so candidate sets can be
+    gathered without scanning the whole catalog. A track costs about 40 bytes in total.
+
+    Because the store holds no per-track Python objects, it can be opened straight from the
+    memory-mapped files written by save(). Every process that opens the same cache directory
+    shares one copy of the data through the OS page cache.
+    """
+
+    def __init__(self, ids, quantized_features, feature_scale, primary_artists,
+                 artist_keys, artist_offsets, artist_rows, album_keys, album_offsets, album_rows):
+        """
+        Initializes a FeatureStore from already-built arrays.
+
+        Args:
+            ids (numpy.ndarray): The sorted, packed track ID of every row.
+            quantized_features (numpy.ndarray): The quantized feature matrix, one row per track.
+            feature_scale (numpy.ndarray): A (2, len(FEATURE_COLUMNS)) array of each column's
+                minimum and quantization step.
+            primary_artists (numpy.ndarray): The position in artist_keys of each row's first artist, or -1.
+            artist_keys, artist_offsets, artist_rows (numpy.ndarray): The artist index; the rows
+                of artist_keys[i] are artist_rows[artist_offsets[i]:artist_offsets[i + 1]].
+            album_keys, album_offsets, album_rows (numpy.ndarray): The album index, laid out the same way.
+        """
+        self._ids = ids
+        self._quantized_features = quantized_features
+        self._feature_scale = feature_scale
+        self._primary_artists = primary_artists
+        self._artist_index = (artist_keys, artist_offsets, artist_rows)
+        self._album_index = (album_keys, album_offsets, album_rows)
+
+    @classmethod
+    def from_csv(cls, csv_file=DEFAULT_CSV, workers=None):
+        """
+        Builds a FeatureStore, including its inverted indexes, from the tracks CSV.
+
+        The file is split at line boundaries into byte ranges that are parsed, and their IDs
+        packed, in parallel by a pool of worker processes. The packed columns are then merged
+        in file order, so if a track ID appears more than once its last row still wins. Malformed rows (wrong number of fields or
+        unparseable features) are skipped and counted rather than aborting the build.
+
+        Args:
+            csv_file: The path to the CSV file containing audio features.
+            workers: The number of worker processes; defaults to the number of CPUs.
+
+        Returns:
+            FeatureStore: The populated store.
+        """
+        workers = workers or os.cpu_count() or 1
+        with open(csv_file, mode='rb') as file:
+            header = next(csv.reader([file.readline().decode("utf-8")]))
+        columns = _column_indices(header)
+        ranges = _csv_ranges(csv_file, workers * CHUNKS_PER_WORKER)
+
+        if workers == 1 or len(ranges) == 1:
+            chunks = [_parse_range(csv_file, start, end, columns) for start, end in ranges]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = list(executor.map(_parse_range, *zip(*((csv_file, start, end, columns) for start, end in ranges))))
+
+        # Chunk rows are numbered from zero, so shift them past the rows of earlier chunks
+        row_offsets = np.cumsum([0] + [len(chunk["features"]) for chunk in chunks])
+        malformed = sum(chunk["malformed"] for chunk in chunks)
+        if malformed:
+            print(f"Skipped {malformed} malformed rows in {csv_file}")
+
+        def merged(column):
+            return _concatenate_encoded([chunk[column] for chunk in chunks])
+
+        return cls.build(
+            merged("ids"), np.concatenate([chunk["features"] for chunk in chunks]) if chunks else [],
+            merged("first_artists"), merged("artist_ids"),
+            np.concatenate([chunk["artist_rows"] + offset for chunk, offset in zip(chunks, row_offsets)]) if chunks else [],
+            merged("album_ids"), np.arange(row_offsets[-1]),
+        )
+
+    @classmethod
+    def build(cls, ids, features, first_artists, artist_ids, artist_rows, album_ids, album_rows):
+        """
+        Builds a FeatureStore from parsed columns, in the order the tracks were read.
+
+        Rows are sorted by ID, keeping the last of any duplicate IDs, rows whose ID is not a
+        valid Spotify ID are dropped, features are quantized, and the inverted indexes are
+        built. IDs are passed already packed, as the (keys, valid) pairs returned by
+        encode_ids, so packing can happen wherever the columns were parsed.
+
+        Args:
+            ids: The packed track ID of each track.
+            features: The FEATURE_COLUMNS values of each track.
+            first_artists: The packed ID of each track's first artist (invalid if it has none).
+            artist_ids, artist_rows: Packed artist IDs and, in parallel, the position of one of each artist's tracks.
+            album_ids, album_rows: Packed album IDs and, in parallel, the position of one of each album's tracks.
+
+        Returns:
+            FeatureStore: The populated store.
+        """
+        ids, valid = ids
+        features = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS))
+
+        # Sort valid rows by ID, keeping the last of any duplicates, and remember where each input row went
+        order = np.flatnonzero(valid)[np.argsort(ids[valid], kind="stable")]
+        sorted_ids = ids[order]
+        run_start = np.ones(len(order), dtype=bool)
+        run_start[1:] = sorted_ids[1:] != sorted_ids[:-1]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = run_start[1:]
+        new_row = np.full(len(ids), -1, dtype=np.int32)
+        new_row[order] = np.cumsum(run_start) - 1
+
+        artist_index = _build_index(*artist_ids, new_row[np.asarray(artist_rows, dtype=np.int64)])
+        album_index = _build_index(*album_ids, new_row[np.asarray(album_rows, dtype=np.int64)])
+        primary_artists = _positions(artist_index[0], *first_artists)[order[keep]]
+
+        return cls(sorted_ids[keep], *_quantize(features[order[keep]]), primary_artists, *artist_index, *album_index)
+
+    @classmethod
+    def load(cls, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Opens a store saved with save() without copying it into process memory.
+
+        Args:
+            cache_dir: The directory the store was saved to.
+
+        Returns:
+            FeatureStore: A store backed by read-only memory maps of the saved arrays.
+        """
+        return cls(*(np.load(os.path.join(cache_dir, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS))
+
+    def save(self, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Saves the store's arrays to a directory so that other processes can load() it.
+
+        The arrays are written to a temporary directory that then replaces cache_dir, so a
+        process never opens a partially written store.
+
+        Args:
+            cache_dir: The directory to save the store to.
+        """
+        arrays = dict(zip(_ARRAYS, (
+            self._ids, self._quantized_features, self._feature_scale, self._primary_artists,
+            *self._artist_index, *self._album_index,
+        )))
+        tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+        if os.path.isdir(cache_dir):
+            shutil.rmtree(cache_dir)
+        os.rename(tmp_dir, cache_dir)
+
+    @property
+    def nbytes(self):
+        """
+        The total size in bytes of the store's arrays.
+        """
+        return sum(array.nbytes for array in (
+            self._ids, self._quantized_features, self._feature_scale, self._primary_artists,
+            *self._artist_index, *self._album_index,
+        ))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, track_id):
+        return self.row(track_id) is not None
+
+    def row(self, track_id):
+        """
+        Returns the row of a track, or None if the track is not in the store.
+        """
+        row = int(self.rows([track_id])[0])
+        return row if row >= 0 else None
+
+    def rows(self, track_ids):
+        """
+        Looks up the rows of many tracks at once.
+
+        Args:
+            track_ids: A sequence of Spotify track IDs.
+
+        Returns:
+            numpy.ndarray: The row of each track, or -1 where a track is not in the store.
+        """
+        return _positions(self._ids, *encode_ids(track_ids))
+
+    def features(self, rows):
+        """
+        Returns the audio features of a row or of a sequence of rows.
+
+        Args:
+            rows: A row index or a sequence of row indices.
+
+        Returns:
+            numpy.ndarray: The row's features, or a (len(rows), len(FEATURE_COLUMNS)) matrix,
+            in FEATURE_COLUMNS order.
+        """
+        minimum, step = self._feature_scale
+        return self._quantized_features[rows] * step + minimum
+
+    def track_id(self, row):
+        """
+        Returns the track ID stored at a row.
+        """
+        return decode_ids(self._ids[row:row + 1])[0]
+
+    def track_ids(self, rows):
+        """
+        Returns the track IDs stored at a sequence of rows.
+        """
+        return decode_ids(self._ids[np.asarray(rows, dtype=np.int64)])
+
+    def primary_artists(self, rows):
+        """
+        Returns an integer label for the first artist of each row, or -1 where a row has none.
+
+        Labels are only meaningful for comparing rows with each other (e.g. to cap tracks per artist).
+        """
+        return np.asarray(self._primary_artists[np.asarray(rows, dtype=np.int64)])
+
+    def expand(self, artist_ids=(), album_ids=()):
+        """
+        Gathers the rows of every track by the given artists or on the given albums.
+
+        Runs in time proportional to the number of candidates found, not the catalog size.
+
+        Args:
+            artist_ids: An iterable of Spotify artist IDs.
+            album_ids: An iterable of Spotify album IDs.
+
+        Returns:
+            numpy.ndarray: The sorted, de-duplicated candidate rows.
+        """
+        parts = _lookup(self._artist_index, artist_ids) + _lookup(self._album_index, album_ids)
+        if not parts:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(parts))
+
+
+def encode_ids(ids):
+    """
+    Packs 22-character base62 Spotify IDs into 128-bit integers stored as 16 big-endian bytes.
+
+    The IDs are decoded digit by digit across all IDs at once, holding each integer as four
+    32-bit limbs.
+
+    Args:
+        ids: A sequence of Spotify IDs.
+
+    Returns:
+        tuple: The packed IDs (numpy.ndarray of dtype S16) and a boolean array marking which
+        inputs were valid Spotify IDs. Invalid IDs are packed as zero.
+    """
+    raw = np.array([
+        track_id.encode("ascii", "replace") if isinstance(track_id, str) and len(track_id) == _ID_LENGTH else b""
+        for track_id in ids
+    ], dtype=f"S{_ID_LENGTH}")
+    digits = _DIGITS[raw.view(np.uint8).reshape(-1, _ID_LENGTH)]
+    valid = (digits < 62).all(axis=1)
+    digits = np.where(digits < 62, digits, 0).astype(np.uint64)
+
+    limbs = np.zeros((len(raw), 4), dtype=np.uint64)
+    for column in range(_ID_LENGTH):
+        carry = digits[:, column]
+        for limb in (3, 2, 1, 0):
+            value = limbs[:, limb] * np.uint64(62) + carry
+            limbs[:, limb] = value & np.uint64(0xFFFFFFFF)
+            carry = value >> np.uint64(32)
+        # Anything carried out of the top limb does not fit in 128 bits
+        valid &= carry == 0
+
+    limbs[~valid] = 0
+    return limbs.astype(">u4").view(_ID_DTYPE).ravel(), valid
+
+
+def decode_ids(keys):
+    """
+    Unpacks IDs packed by encode_ids back into 22-character base62 Spotify IDs.
+
+    Args:
+        keys (numpy.ndarray): Packed IDs.
+
+    Returns:
+        list[str]: The Spotify IDs.
+    """
+    keys = np.ascontiguousarray(keys, dtype=_ID_DTYPE)
+    limbs = np.frombuffer(keys.tobytes(), dtype=">u4").reshape(-1, 4).astype(np.uint64)
+    chars = np.empty((len(keys), _ID_LENGTH), dtype=np.uint8)
+    for column in range(_ID_LENGTH - 1, -1, -1):
+        remainder = np.zeros(len(keys), dtype=np.uint64)
+        for limb in range(4):
+            value = (remainder << np.uint64(32)) | limbs[:, limb]
+            limbs[:, limb] = value // np.uint64(62)
+            remainder = value % np.uint64(62)
+        chars[:, column] = _ALPHABET[remainder]
+    return [track_id.decode("ascii") for track_id in chars.view(f"S{_ID_LENGTH}").ravel()]
+
+
+def _column_indices(header):
+    """
+    Finds the positions of the columns the store reads in the CSV header.
+
+    Returns:
+        tuple: The positions of the id, artist_ids, and album_id columns, and of each of FEATURE_COLUMNS.
+
+    Raises:
+        ValueError: If a required column is missing from the header.
+    """
+    missing = [column for column in ("id", "artist_ids", "album_id", *FEATURE_COLUMNS) if column not in header]
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(missing)}")
+    return (
+        header.index("id"), header.index("artist_ids"), header.index("album_id"),
+        tuple(header.index(column) for column in FEATURE_COLUMNS),
+    )
+
+
+def _csv_ranges(csv_file, chunks):
+    """
+    Splits a CSV file, after its header, into byte ranges of roughly equal size that start and end on line boundaries.
+
+    Returns:
+        list[tuple]: The (start, end) byte offsets of each range, in file order.
+    """
+    size = os.path.getsize(csv_file)
+    with open(csv_file, mode='rb') as file:
+        file.readline()
+        start = file.tell()
+        chunk_size = max(MIN_CHUNK_BYTES, -(-(size - start) // chunks))
+        ranges = []
+        while start < size:
+            file.seek(min(start + chunk_size, size))
+            file.readline()
+            end = min(file.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _parse_range(csv_file, start, end, columns):
+    """
+    Parses the CSV rows in one byte range into typed columns.
+
+    Runs in a worker process. Rows are read as plain field lists and only the needed
+    columns are converted, instead of building a dict per row, and the ID columns are
+    packed here too so the parent process only merges arrays.
+
+    Args:
+        csv_file: The path to the CSV file.
+        start, end: The byte range to parse; both must fall on line boundaries.
+        columns: The column positions returned by _column_indices.
+
+    Returns:
+        dict: The ids, features, first_artists, artist_ids, artist_rows, and album_ids of the
+        range's rows (with rows numbered from zero, and IDs packed by encode_ids), and the
+        number of malformed rows skipped.
+    """
+    id_column, artists_column, album_column, feature_columns = columns
+    width = max(id_column, artists_column, album_column, *feature_columns) + 1
+
+    with open(csv_file, mode='rb') as file:
+        file.seek(start)
+        text = file.read(end - start).decode("utf-8", "replace")
+
+    ids = []
+    features = []
+    first_artists = []
+    artist_ids = []
+    artist_rows = []
+    album_ids = []
+    malformed = 0
+    for fields in csv.reader(io.StringIO(text, newline="")):
+        if not fields:
+            continue
+        try:
+            if len(fields) < width:
+                raise ValueError("too few fields")
+            values = tuple(float(fields[column]) for column in feature_columns)
+        except ValueError:
+            malformed += 1
+            continue
+
+        row = len(ids)
+        ids.append(fields[id_column])
+        features.append(values)
+        track_artists = _SPOTIFY_ID.findall(fields[artists_column])
+        first_artists.append(track_artists[0] if track_artists else "")
+        artist_ids.extend(track_artists)
+        artist_rows.extend([row] * len(track_artists))
+        album_ids.append(fields[album_column])
+
+    return {
+        "ids": encode_ids(ids),
+        "features": np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURE_COLUMNS)),
+        "first_artists": encode_ids(first_artists),
+        "artist_ids": encode_ids(artist_ids),
+        "artist_rows": np.asarray(artist_rows, dtype=np.int64),
+        "album_ids": encode_ids(album_ids),
+        "malformed": malformed,
+    }
+
+
+def _concatenate_encoded(parts):
+    """
+    Joins (keys, valid) pairs returned by encode_ids into one pair, in order.
+    """
+    if not parts:
+        return encode_ids([])
+    return np.concatenate([keys for keys, _ in parts]), np.concatenate([valid for _, valid in parts])
+
+
+def _quantize(features):
+    """
+    Quantizes each feature column to 16 bits between the column's minimum and maximum.
+
+    Returns:
+        tuple: The quantized matrix and a (2, columns) array of each column's minimum and step.
+    """
+    if len(features) == 0:
+        return features.astype(_QUANTIZED_DTYPE), np.vstack([np.zeros(features.shape[1]), np.ones(features.shape[1])])
+    minimum = features.min(axis=0)
+    step = (features.max(axis=0) - minimum) / _QUANTIZED_LEVELS
+    step[step == 0] = 1
+    quantized = np.rint((features - minimum) / step).astype(_QUANTIZED_DTYPE)
+    return quantized, np.vstack([minimum, step])
+
+
+def _build_index(keys, valid, rows):
+    """
+    Builds an inverted index in compressed sparse row form from packed keys (see encode_ids) and parallel rows.
+
+    Pairs whose key is not a valid Spotify ID or whose row was dropped are left out.
+
+    Returns:
+        tuple: The sorted unique keys, the offsets into the rows array, and the rows grouped by key.
+    """
+    rows = np.asarray(rows, dtype=np.int32)
+    valid &= rows >= 0
+    keys, rows = keys[valid], rows[valid]
+    order = np.argsort(keys, kind="stable")
+    keys, rows = keys[order], rows[order]
+    unique_keys, starts = np.unique(keys, return_index=True)
+    offsets = np.append(starts, len(keys)).astype(np.int64)
+    return unique_keys, offsets, rows
+
+
+def _positions(sorted_keys, keys, valid):
+    """
+    Returns the position of each packed key in a sorted key array, or -1 where a key is missing or invalid.
+    """
+    if sorted_keys.size == 0 or keys.size == 0:
+        return np.full(keys.size, -1, dtype=np.int32)
+    positions = np.minimum(np.searchsorted(sorted_keys, keys), sorted_keys.size - 1)
+    return np.where(valid & (sorted_keys[positions] == keys), positions, -1).astype(np.int32)
+
+
+def _lookup(index, keys):
+    """
+    Returns the row arrays of every key found in an inverted index.
+    """
+    index_keys, offsets, rows = index
+    positions = _positions(index_keys, *encode_ids(list(keys)))
+    found = positions[positions >= 0]
+    return [rows[offsets[i]:offsets[i + 1]] for i in found]
+
+
+def _cache_complete(cache_dir):
+    """
+    Checks whether a cache directory holds every array of the current store layout.
+    """
+    return all(os.path.isfile(os.path.join(cache_dir, f"{name}.npy")) for name in _ARRAYS)
+
+
+@contextlib.contextmanager
+def _cache_lock(cache_dir, exclusive):
+    """
+    Holds a lock on a lock file next to a cache directory, coordinating processes that build or load it.
+
+    Builds take the lock exclusively and loads take it shared, so a process never loads a
+    store while another replaces it, and only one process builds a missing store.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(cache_dir)), exist_ok=True)
+    with open(f"{cache_dir}.lock", mode='a') as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def build_cache(csv_file=DEFAULT_CSV, cache_dir=DEFAULT_CACHE_DIR, workers=None, rebuild=False):
+    """
+    Builds the store from the CSV and saves it to cache_dir, unless another process already has.
+
+    Args:
+        csv_file: The path to the CSV file containing audio features.
+        cache_dir: The directory to save the store to.
+        workers: The number of worker processes used to parse the CSV (see FeatureStore.from_csv).
+        rebuild: If True, rebuild even if the cache is already complete.
+
+    Returns:
+        FeatureStore or None: The newly built store, or None if the cache was already complete.
+    """
+    with _cache_lock(cache_dir, exclusive=True):
+        # Another process may have built the cache while this one waited for the lock
+        if not rebuild and _cache_complete(cache_dir):
+            return None
+        store = FeatureStore.from_csv(csv_file, workers=workers)
+        store.save(cache_dir)
+        return store
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_feature_store(csv_file=DEFAULT_CSV, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns the process-wide FeatureStore.
+
+    The store is memory-mapped from cache_dir so that worker processes share it. If the
+    cache has not been built yet, the first process to get there builds it from the CSV
+    while the others wait for it; build it ahead of time (python feature_store.py) to keep
+    workers from waiting on startup.
+
+    Args:
+        csv_file: The path to the CSV file containing audio features.
+        cache_dir: The directory holding the saved store.
+
+    Returns:
+        FeatureStore: The shared store.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if not _cache_complete(cache_dir):
+                    build_cache(csv_file, cache_dir)
+                with _cache_lock(cache_dir, exclusive=False):
+                    _store = FeatureStore.load(cache_dir)
+    return _store
+
+
+if __name__ == "__main__":
+    # Build (or rebuild) the shared feature cache ahead of starting the server's workers
+    csv_file = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_CSV
+    cache_dir = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_CACHE_DIR
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    started = time.perf_counter()
+    store = build_cache(csv_file, cache_dir, workers=workers, rebuild=True)
+    elapsed = time.perf_counter() - started
+    print(f"Built and saved {len(store)} tracks in {elapsed:.1f}s ({len(store) / elapsed:,.0f} rows/sec)")
+    print(f"{store.nbytes / len(store):.1f} bytes per track in {cache_dir}")
@@ -1,9 +1,33 @@
-import csv
 from dotenv import load_dotenv
 import os
-from data_structures import PriorityQueue
-from converter import PlaylistConverter 
+import numpy as np
+from data_structures import LRUCache, PriorityQueue
+from converter import PlaylistConverter, report_progress
+from bulk_writer import BulkWriteError
+from diversity import mmr_select
+from feature_store import FEATURE_COLUMNS, get_feature_store
 import re
+import sys
+
+# "seed" re-ranks the seed playlist; "expand" draws from the seed's artists and albums
+GENERATION_MODES = ("seed", "expand")
+
+# Rankings are cached per seed and quantized mood; energy/valence are rounded to this step
+TARGET_QUANTUM = 0.01
+RANKING_CACHE_SIZE = 256
+RANKING_CACHE_TTL = 600  # seconds
+
+# Most track IDs Spotify accepts in one tracks() lookup
+SPOTIFY_TRACKS_BATCH_SIZE = 50
+
+# Target danceability for each environment
+ENVIRONMENT_DANCEABILITY = {
+    "gym": 0.7,
+    "car": 0.6,
+    "home": 0.4,
+    "party": 0.9,
+    "default": 0.5
+}
 
 
 class PlaylistGenerator:
@@ -21,11 +45,12 @@ class PlaylistGenerator:
         self._converter = PlaylistConverter()  # Initialize the PlaylistConverter
         self._spotify = self._converter._spotify
         self._spotify_username = os.getenv("SPOTIFY_USERNAME")
+        self._ranking_cache = LRUCache(RANKING_CACHE_SIZE, ttl=RANKING_CACHE_TTL)
 
     def fetch_seed_tracks(self, playlist_url, seed_platform):
         """
         Fetches tracks from a seed playlist on either Spotify or YouTube.
-        Converts YouTube playlist to Spotify if necessary.
+        Resolves YouTube tracks to their Spotify matches if necessary.
 
         Args:
             playlist_url: The URL of the playlist.
@@ -37,13 +62,14 @@ class PlaylistGenerator:
         Raises:
             ValueError: If no tracks are found in the seed playlist.
         """
-        url = playlist_url
         if seed_platform == "youtube":
-            # Convert the YouTube playlist to a Spotify playlist URL
-            url = self._converter.convert_playlist(playlist_url, "spotify")
-        
+            seed_tracks = self._resolve_youtube_seed(playlist_url)
+            if not seed_tracks:
+                raise ValueError("No tracks found in the seed playlist")
+            return seed_tracks
+
         seed_tracks = []
-        results = self._spotify.playlist_tracks(url)
+        results = self._spotify.playlist_tracks(playlist_url)
 
         # Collect all tracks in the playlist (handle pagination)
         while results:
@@ -56,33 +82,250 @@ class PlaylistGenerator:
             raise ValueError("No tracks found in the seed playlist")
         return seed_tracks
 
+    def _resolve_youtube_seed(self, playlist_url):
+        """
+        Matches the tracks of a YouTube Music playlist to Spotify tracks in memory.
+
+        Tracks are matched through the converter's cached, concurrent search, so no Spotify
+        playlist is created or read back. Each match keeps the video ID it was matched from,
+        so a YouTube playlist generated from the seed can reuse it instead of searching again.
+
+        Args:
+            playlist_url: The URL of the YouTube Music playlist.
+
+        Returns:
+            A list of the matched Spotify tracks (see PlaylistConverter.search_spotify_track),
+            in playlist order, each with its source "video_id" (None if the source had none).
+        """
+        items = self._converter._get_youtube_items(playlist_url)
+        matches = self._converter._resolve_all([track_str for _, track_str in items], self._converter.search_spotify_track)
+        return [
+            # Matches are shared through the search cache, so each seed track gets its own copy;
+            # items without a video ID are keyed by their title and artist instead
+            dict(match, video_id=source_id if source_id != track_str else None)
+            for (source_id, track_str), match in zip(items, matches) if match
+        ]
+
+    def _rank_seed_tracks(self, seed_tracks, targets, amount, diversity=0.0, max_per_artist=None):
+        """
+        Ranks the seed tracks themselves by how closely they match the mood targets.
+
+        Args:
+            seed_tracks: A list of track information from the seed playlist.
+            targets (numpy.ndarray): The target feature values, in FEATURE_COLUMNS order.
+            amount: The maximum number of tracks to return.
+            diversity: The weight given to variety over closeness to the targets (0 to 1).
+            max_per_artist: The most tracks any one artist may contribute, or None for no cap.
+
+        Returns:
+            A list of track IDs, best match first.
+        """
+        store = get_feature_store()
+
+        if diversity > 0 or max_per_artist is not None:
+            rows, artists = self._seed_candidates(seed_tracks)
+            features = store.features(rows)
+            selected = mmr_select(features, score_features(features, targets), amount, diversity, artists, max_per_artist)
+            return store.track_ids(rows[selected])
 
-    def load_audio_features(self, csv_file="backend/tracks_features.csv"):
+        # Initialize a priority queue to rank tracks by how well they match the targets
+        prioritized_tracks = PriorityQueue()
+
+        # Calculate a score for each track based on its similarity to the target features
+        for track in seed_tracks:
+            track_id = track["id"]
+            row = store.row(track_id)
+            if row is not None:
+                score = float(score_features(store.features(row), targets))
+                # Insert the track into the priority queue with the calculated score (lower score = higher priority)
+                prioritized_tracks.insert(track_id, score)
+
+        # Get the top tracks from the priority queue
+        top_tracks = []
+        for _ in range(min(amount, prioritized_tracks.size())):
+            top_tracks.append(prioritized_tracks.pop())
+        return top_tracks
+
+    def _rank_catalog_tracks(self, seed_tracks, targets, amount, diversity=0.0, max_per_artist=None):
         """
-        Loads audio features (energy, valence, danceability, loudness) from a CSV file.
+        Ranks catalog tracks by the seed's artists and albums by how closely they match the mood targets.
+
+        Candidates are gathered from the feature store's artist and album indexes, so the cost
+        grows with the number of candidates rather than the size of the catalog. Tracks already
+        in the seed are left out.
 
         Args:
-            csv_file: The path to the CSV file containing audio features.
+            seed_tracks: A list of track information from the seed playlist.
+            targets (numpy.ndarray): The target feature values, in FEATURE_COLUMNS order.
+            amount: The maximum number of tracks to return.
+            diversity: The weight given to variety over closeness to the targets (0 to 1).
+            max_per_artist: The most tracks any one artist may contribute, or None for no cap.
 
         Returns:
-            A dictionary mapping track IDs to their audio features.
+            A list of track IDs, best match first.
         """
-        audio_features = {}
-
-        # Link to Kaggle Dataset CSV: https://www.kaggle.com/datasets/rodolfofigueroa/spotify-12m-songs?resource=download)
-        with open(csv_file, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                song_id = row["id"]
-                audio_features[song_id] = {
-                    "energy": float(row["energy"]),
-                    "valence": float(row["valence"]),
-                    "danceability": float(row["danceability"]),
-                    "loudness": float(row["loudness"]),
-                }
-        return audio_features
-
-    def generate_playlist_from_seed(self, seed_playlist_url, seed_platform, target_platform, target_energy, target_valence, activity, environment, amount, playlist_name="Generated Playlist"):
+        store = get_feature_store()
+
+        candidates, artists = self._catalog_candidates(seed_tracks)
+        if candidates.size == 0:
+            return []
+
+        features = store.features(candidates)
+        scores = score_features(features, targets)
+        if diversity > 0 or max_per_artist is not None:
+            best = mmr_select(features, scores, amount, diversity, artists, max_per_artist)
+        elif amount < candidates.size:
+            best = np.argpartition(scores, amount)[:amount]
+        else:
+            best = np.arange(candidates.size)
+        if diversity == 0 and max_per_artist is None:
+            best = best[np.argsort(scores[best], kind="stable")]
+        return store.track_ids(candidates[best])
+
+    def _seed_candidates(self, seed_tracks):
+        """
+        Gathers the feature store rows of the seed tracks, in seed order.
+
+        Args:
+            seed_tracks: A list of track information from the seed playlist.
+
+        Returns:
+            tuple: The rows of the seed tracks found in the store, and an artist label for each.
+        """
+        rows = get_feature_store().rows([track["id"] for track in seed_tracks])
+        found = np.flatnonzero(rows >= 0)
+        # Fall back to the track ID so tracks without an artist ID are never grouped together
+        artists = [seed_tracks[i]["artists"][0].get("id") or seed_tracks[i]["id"] for i in found]
+        return rows[found], artists
+
+    def _catalog_candidates(self, seed_tracks):
+        """
+        Gathers the feature store rows of catalog tracks by the seed's artists or on its albums, leaving out the seed itself.
+
+        Args:
+            seed_tracks: A list of track information from the seed playlist.
+
+        Returns:
+            tuple: The candidate rows, and an artist label for each.
+        """
+        store = get_feature_store()
+
+        artist_ids = {artist["id"] for track in seed_tracks for artist in track["artists"] if artist.get("id")}
+        album_ids = {track["album"]["id"] for track in seed_tracks if track.get("album") and track["album"].get("id")}
+        candidates = store.expand(artist_ids, album_ids)
+
+        seed_rows = store.rows([track["id"] for track in seed_tracks])
+        candidates = np.setdiff1d(candidates, seed_rows[seed_rows >= 0])
+        artists = store.primary_artists(candidates)
+        # Rows without an artist get a label of their own so an artist cap never groups them together
+        artists = np.where(artists >= 0, artists, -(candidates.astype(np.int64) + 1))
+        return candidates, artists
+
+    def _ranking_key(self, seed_tracks, mode, target_energy, target_valence, activity, environment, amount, diversity, max_per_artist):
+        """
+        Builds the ranking cache key for a request whose energy and valence are already quantized.
+        """
+        return (mode, tuple(track["id"] for track in seed_tracks), target_energy, target_valence, activity, environment, amount, diversity, max_per_artist)
+
+    def rank_tracks(self, seed_tracks, target_energy, target_valence, activity, environment, amount, mode="seed", diversity=0.0, max_per_artist=None):
+        """
+        Ranks tracks for a seed and mood, reusing a recent ranking for the same request if there is one.
+
+        Energy and valence are quantized to TARGET_QUANTUM before ranking, so requests whose
+        sliders differ only below that resolution share a cached result. Cached rankings are
+        keyed by the seed's track IDs, so any change to the seed playlist misses the cache.
+
+        Args:
+            seed_tracks: A list of track information from the seed playlist.
+            target_energy: The target energy for the playlist tracks (0 to 1).
+            target_valence: The target valence (mood) for the playlist tracks (0 to 1).
+            activity: The activity type (e.g., "working out", "relaxing").
+            environment: The environment type (e.g., "gym", "party").
+            amount: The maximum number of tracks to return.
+            mode: "seed" or "expand" (see generate_playlist_from_seed).
+            diversity: The weight given to variety over closeness to the targets (0 to 1).
+            max_per_artist: The most tracks any one artist may contribute, or None for no cap.
+
+        Returns:
+            A list of track IDs, best match first.
+        """
+        target_energy = quantize_target(target_energy)
+        target_valence = quantize_target(target_valence)
+        key = self._ranking_key(seed_tracks, mode, target_energy, target_valence, activity, environment, amount, diversity, max_per_artist)
+
+        top_tracks = self._ranking_cache.get(key)
+        if top_tracks is None:
+            targets = mood_targets(target_energy, target_valence, activity, environment)
+            if mode == "expand":
+                top_tracks = self._rank_catalog_tracks(seed_tracks, targets, amount, diversity, max_per_artist)
+            else:
+                top_tracks = self._rank_seed_tracks(seed_tracks, targets, amount, diversity, max_per_artist)
+            self._ranking_cache.put(key, top_tracks)
+
+        # Hand out a copy so callers cannot alter the cached ranking
+        return list(top_tracks)
+
+    def rank_profiles(self, seed_tracks, profiles, mode="seed"):
+        """
+        Ranks tracks from one seed for several mood profiles at once.
+
+        The candidates and their features are gathered once, and every profile without
+        diversity settings is scored in a single (profiles x candidates) matrix operation,
+        followed by one batched top-k selection. Profiles with diversity settings are re-ranked
+        individually over the same features. Results share the ranking cache with rank_tracks.
+
+        Args:
+            seed_tracks: A list of track information from the seed playlist.
+            profiles: A list of dicts with target_energy, target_valence, activity, environment,
+                and amount, and optionally diversity and max_per_artist (see rank_tracks).
+            mode: "seed" or "expand" (see generate_playlist_from_seed).
+
+        Returns:
+            A list with one list of track IDs per profile, best match first.
+        """
+        store = get_feature_store()
+        requests = []
+        for profile in profiles:
+            request = {
+                "target_energy": quantize_target(profile["target_energy"]),
+                "target_valence": quantize_target(profile["target_valence"]),
+                "activity": profile["activity"],
+                "environment": profile["environment"],
+                "amount": profile["amount"],
+                "diversity": profile.get("diversity", 0.0),
+                "max_per_artist": profile.get("max_per_artist"),
+            }
+            requests.append((self._ranking_key(seed_tracks, mode, **request), request))
+
+        rankings = [self._ranking_cache.get(key) for key, _ in requests]
+        pending = [i for i, ranking in enumerate(rankings) if ranking is None]
+        if pending:
+            if mode == "expand":
+                rows, artists = self._catalog_candidates(seed_tracks)
+            else:
+                rows, artists = self._seed_candidates(seed_tracks)
+            features = store.features(rows)
+
+            targets = np.array([
+                mood_targets(request["target_energy"], request["target_valence"], request["activity"], request["environment"])
+                for _, request in (requests[i] for i in pending)
+            ]).reshape(-1, len(FEATURE_COLUMNS))
+            # One row of scores per profile
+            scores = score_features(features[np.newaxis, :, :], targets[:, np.newaxis, :])
+            top = _top_k_rows(scores, max(requests[i][1]["amount"] for i in pending))
+
+            for position, i in enumerate(pending):
+                key, request = requests[i]
+                if request["diversity"] > 0 or request["max_per_artist"] is not None:
+                    best = mmr_select(features, scores[position], request["amount"], request["diversity"], artists, request["max_per_artist"])
+                else:
+                    best = top[position][:request["amount"]]
+                rankings[i] = store.track_ids(rows[best])
+                self._ranking_cache.put(key, rankings[i])
+
+        return [list(ranking) for ranking in rankings]
+
+    def generate_playlist_from_seed(self, seed_playlist_url, seed_platform, target_platform, target_energy, target_valence, activity, environment, amount, playlist_name="Generated Playlist", mode="seed", diversity=0.0, max_per_artist=None, progress=None):
         """
         Generates a playlist from a seed playlist based on the provided criteria such as target energy, 
         valence, activity, environment, and desired track amount.
@@ -97,71 +340,242 @@ class PlaylistGenerator:
             environment: The environment type (e.g., "gym", "party").
             amount: The number of tracks to include in the generated playlist.
             playlist_name: The name of the generated playlist.
+            mode: "seed" to pick the best-matching seed tracks, or "expand" to draw new tracks
+                from the seed's artists and albums in the catalog.
+            diversity: The weight given to variety over closeness to the targets, from 0
+                (closest matches only) to 1. Above 0, near-identical tracks are spread out.
+            max_per_artist: The most tracks any one artist may contribute, or None for no cap.
+            progress: An optional callable taking an event name and a dict of event data. It is
+                told "tracks_fetched" with the seed track count, "ranked" with the number of tracks
+                chosen, and then receives the events of the playlist writes (see
+                PlaylistConverter.convert_playlist).
 
         Returns:
             A string URL of the generated playlist on the target platform.
         
         Raises:
-            ValueError: If no tracks are found in the seed playlist or if the target platform is invalid.
+            ValueError: If no tracks are found in the seed playlist or if the target platform or mode is invalid.
         """
+        if mode not in GENERATION_MODES:
+            raise ValueError("Unsupported generation mode")
+
         # Fetch the seed tracks from the given playlist URL
         seed_tracks = self.fetch_seed_tracks(seed_playlist_url, seed_platform)
         if not seed_tracks:
             raise ValueError("No tracks found in the seed playlist.")
- 
-        audio_features = self.load_audio_features()
-
-        # Set the target loudness based on the activity type
-        target_loudness = -7
-        if activity in ["working out", "partying"]:
-            target_loudness = -4
-        elif activity in ["relaxing", "studying"]:
-            target_loudness = -14
-
-        # Define target danceability based on environment
-        environment_danceability_map = {
-            "gym": 0.7,
-            "car": 0.6,
-            "home": 0.4,
-            "party": 0.9,
-            "default": 0.5
-        }
-        target_danceability = environment_danceability_map.get(environment, environment_danceability_map["default"])
+        report_progress(progress, "tracks_fetched", count=len(seed_tracks))
 
-        # Initialize a priority queue to rank tracks by how well they match the targets
-        prioritized_tracks = PriorityQueue()
+        top_tracks = self.rank_tracks(seed_tracks, target_energy, target_valence, activity, environment, amount, mode, diversity, max_per_artist)
+        report_progress(progress, "ranked", count=len(top_tracks))
 
-        # Calculate a score for each track based on its similarity to the target features
-        for track in seed_tracks:
-            track_id = track["id"]
-            if track_id in audio_features:
-                features = audio_features[track_id]
-                # Calculate a score based on the difference from the target values
-                score = abs(features["energy"] - target_energy) \
-                        + abs(features["valence"] - target_valence) \
-                        + abs(features["loudness"] - target_loudness) \
-                        + abs(features["danceability"] - target_danceability)
-                # Insert the track into the priority queue with the calculated score (lower score = higher priority)
-                prioritized_tracks.insert(track_id, -score)
+        return self._write_playlist(playlist_name, top_tracks, target_platform, seed_tracks, progress)
 
-        # Get the top tracks from the priority queue
-        top_tracks = []
-        for _ in range(min(amount, prioritized_tracks.size())):
-            top_tracks.append(prioritized_tracks.pop())
+    def generate_playlists_from_seed(self, seed_playlist_url, seed_platform, target_platform, profiles, mode="seed", create_playlists=False, progress=None):
+        """
+        Generates one ranked track list per mood profile from a single seed playlist.
+
+        The seed is fetched once and all profiles are ranked together (see rank_profiles),
+        which is much cheaper than calling generate_playlist_from_seed once per profile.
+
+        Args:
+            seed_playlist_url: The URL of the seed playlist (either Spotify or YouTube).
+            seed_platform: The platform of the seed playlist ("spotify" or "youtube").
+            target_platform: The target platform for the generated playlists ("spotify" or "youtube").
+            profiles: A list of dicts with target_energy, target_valence, activity, environment,
+                and amount, and optionally playlist_name, diversity, and max_per_artist.
+            mode: "seed" or "expand" (see generate_playlist_from_seed).
+            create_playlists: If True, also create a playlist for every profile.
+            progress: An optional progress callback (see generate_playlist_from_seed).
+
+        Returns:
+            A list with one dict per profile, holding its ranked track IDs under "tracks" and,
+            if playlists were created, the playlist URL under "url".
+
+        Raises:
+            ValueError: If no tracks are found in the seed playlist or if the target platform or mode is invalid.
+        """
+        if mode not in GENERATION_MODES:
+            raise ValueError("Unsupported generation mode")
+
+        seed_tracks = self.fetch_seed_tracks(seed_playlist_url, seed_platform)
+        if not seed_tracks:
+            raise ValueError("No tracks found in the seed playlist.")
+        report_progress(progress, "tracks_fetched", count=len(seed_tracks))
+
+        results = [{"tracks": tracks} for tracks in self.rank_profiles(seed_tracks, profiles, mode)]
+        report_progress(progress, "ranked", count=sum(len(result["tracks"]) for result in results))
+
+        if create_playlists:
+            for profile, result in zip(profiles, results):
+                playlist_name = profile.get("playlist_name", "Generated Playlist")
+                result["url"] = self._write_playlist(playlist_name, result["tracks"], target_platform, seed_tracks, progress)
+
+        return results
+
+    def _write_playlist(self, playlist_name, top_tracks, target_platform, seed_tracks=(), progress=None):
+        """
+        Creates a playlist of ranked tracks on the target platform.
+
+        YouTube playlists are written directly, without an intermediate Spotify playlist:
+        tracks from a YouTube seed keep the videos they came from, and the others are searched
+        on YouTube Music by name and artist.
+
+        Args:
+            playlist_name: The name of the playlist.
+            top_tracks: A list of Spotify track IDs.
+            target_platform: The target platform ("spotify" or "youtube").
+            seed_tracks: The seed tracks the ranking came from, used to name tracks for YouTube searches.
+            progress: An optional progress callback (see generate_playlist_from_seed).
+
+        Returns:
+            A string URL of the playlist on the target platform.
+
+        Raises:
+            ValueError: If the target platform is invalid.
+            BulkWriteError: If the playlist could not be created or some tracks could not be added.
+        """
+        if target_platform not in ("spotify", "youtube"):
+            raise ValueError("Unsupported target platform")
+
+        if target_platform == "youtube":
+            return self._converter.write_youtube_playlist(playlist_name, self._youtube_video_ids(top_tracks, seed_tracks, progress), progress=progress)
 
         # Create a new playlist on Spotify
         playlist = self._spotify.user_playlist_create(user=self._spotify_username, name=playlist_name, public=True)
-        self._spotify.user_playlist_add_tracks(user=self._spotify_username, playlist_id=playlist["id"], tracks=top_tracks)
+        try:
+            self._converter.add_spotify_tracks(playlist["id"], top_tracks, progress)
+        except BulkWriteError as e:
+            url = playlist["external_urls"]["spotify"]
+            raise BulkWriteError(f"{e} to {url}", e.written, e.failed, url) from e
+        return playlist["external_urls"]["spotify"]
 
-        # Convert the playlist to the target platform
-        if target_platform == "spotify":
-            playlist_url = playlist["external_urls"]["spotify"]
-        elif target_platform == "youtube":
-            playlist_url = self._converter.convert_playlist(playlist["external_urls"]["spotify"], "youtube")
-        else:
-            raise ValueError("Unsupported target platform")
+    def _youtube_video_ids(self, track_ids, seed_tracks=(), progress=None):
+        """
+        Finds the YouTube video of each ranked track, in ranked order.
+
+        Tracks from a YouTube seed reuse the video they were matched from. The others are
+        searched on YouTube Music by name and artist (see _track_queries).
+
+        Args:
+            track_ids: A list of Spotify track IDs.
+            seed_tracks: Track information already fetched for the seed playlist.
+            progress: An optional progress callback, told about each searched track.
+
+        Yields:
+            The video ID of each track that was found.
+        """
+        known = {track["id"]: track["video_id"] for track in seed_tracks if track.get("video_id")}
+        queries = self._track_queries([track_id for track_id in track_ids if track_id not in known], seed_tracks)
+        searched = self._converter._resolve_all(
+            [queries[track_id] for track_id in track_ids if track_id not in known and track_id in queries],
+            self._converter.search_youtube, progress
+        )
+        for track_id in track_ids:
+            if track_id in known:
+                yield known[track_id]
+            elif track_id in queries:
+                video_id = next(searched)
+                if video_id:
+                    yield video_id
+
+    def _track_queries(self, track_ids, seed_tracks=()):
+        """
+        Builds the "name artist" search string of each track, as used for cross-platform searches.
+
+        Names come from the seed tracks already in memory. Tracks that are not in the seed
+        (e.g. catalog tracks found in expand mode) are looked up on Spotify in batches.
+
+        Args:
+            track_ids: A list of Spotify track IDs.
+            seed_tracks: Track information already fetched for the seed playlist.
+
+        Returns:
+            dict: The search string of each track that could be named, keyed by track ID.
+        """
+        queries = {
+            track["id"]: f"{track['name']} {track['artists'][0]['name']}"
+            for track in seed_tracks if track.get("id") and track.get("artists")
+        }
+        missing = list(dict.fromkeys(track_id for track_id in track_ids if track_id not in queries))
+        for start in range(0, len(missing), SPOTIFY_TRACKS_BATCH_SIZE):
+            for track in self._spotify.tracks(missing[start:start + SPOTIFY_TRACKS_BATCH_SIZE])["tracks"]:
+                if track and track.get("artists"):
+                    queries[track["id"]] = f"{track['name']} {track['artists'][0]['name']}"
+        return {track_id: queries[track_id] for track_id in track_ids if track_id in queries}
+
+
+def _top_k_rows(scores, amount):
+    """
+    Returns, for every row of a score matrix, the column indices of its lowest scores in ascending order.
+
+    Args:
+        scores (numpy.ndarray): A (rows, candidates) matrix of scores.
+        amount: The number of indices to keep per row.
+
+    Returns:
+        numpy.ndarray: A (rows, min(amount, candidates)) matrix of column indices.
+    """
+    amount = min(amount, scores.shape[1])
+    if amount < scores.shape[1]:
+        best = np.argpartition(scores, amount, axis=1)[:, :amount]
+    else:
+        best = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+    order = np.argsort(np.take_along_axis(scores, best, axis=1), axis=1, kind="stable")
+    return np.take_along_axis(best, order, axis=1)
+
+
+def quantize_target(value):
+    """
+    Rounds a 0 to 1 mood target to the nearest multiple of TARGET_QUANTUM.
+    """
+    return round(round(float(value) / TARGET_QUANTUM) * TARGET_QUANTUM, 6)
+
+
+def mood_targets(target_energy, target_valence, activity, environment):
+    """
+    Derives the target audio features for a mood, activity, and environment.
+
+    Args:
+        target_energy: The target energy (0 to 1).
+        target_valence: The target valence (0 to 1).
+        activity: The activity type (e.g., "working out", "relaxing").
+        environment: The environment type (e.g., "gym", "party").
+
+    Returns:
+        numpy.ndarray: The target feature values, in FEATURE_COLUMNS order.
+    """
+    # Set the target loudness based on the activity type
+    target_loudness = -7
+    if activity in ["working out", "partying"]:
+        target_loudness = -4
+    elif activity in ["relaxing", "studying"]:
+        target_loudness = -14
+
+    # Define target danceability based on environment
+    target_danceability = ENVIRONMENT_DANCEABILITY.get(environment, ENVIRONMENT_DANCEABILITY["default"])
+
+    targets = {
+        "energy": target_energy,
+        "valence": target_valence,
+        "danceability": target_danceability,
+        "loudness": target_loudness,
+    }
+    return np.array([targets[column] for column in FEATURE_COLUMNS], dtype=np.float64)
+
+
+def score_features(features, targets):
+    """
+    Scores features by their total absolute difference from the targets (lower is a better match).
+
+    Args:
+        features (numpy.ndarray): A single feature row or a matrix of feature rows.
+        targets (numpy.ndarray): The target feature values, in FEATURE_COLUMNS order.
+
+    Returns:
+        The score of the row, or an array with the score of each row.
+    """
+    return np.abs(features - targets).sum(axis=-1)
 
-        return playlist_url
 
 def get_valid_url(prompt):
     """
@@ -243,6 +657,12 @@ def get_valid_amount(prompt, min_value, max_value):
 
 
 if __name__ == "__main__":
+    # Non-interactive mode: python generator.py --batch jobs.jsonl results.jsonl [--workers N]
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        from batch import main
+        main(sys.argv[2:])
+        sys.exit()
+
     generator = PlaylistGenerator()
 
     # Define valid platforms, activities, and environments
@@ -0,0 +1,169 @@
+import collections
+import contextvars
+import functools
+import os
+import re
+import sys
+import threading
+import uuid
+from flask import make_response, request
+
+# Requests carrying this header (with any value but "0") are profiled
+PROFILE_HEADER = "X-Profile"
+# The header and the ?profile=1 query flag are only honored for client addresses listed in this variable (comma-separated)
+PROFILE_ALLOWLIST_ENV = "PROFILE_ALLOWLIST"
+# Where profiles are written; defaults to backend/profiles
+PROFILE_DIR_ENV = "PROFILE_DIR"
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(__file__), "profiles")
+# Seconds between stack samples of a profiled request
+SAMPLE_INTERVAL = 0.005
+
+# Request IDs end up in file names, so only simple IDs from clients are kept
+_SAFE_REQUEST_ID = re.compile(r"^[\w-]{1,64}$")
+
+# Names of threads started on behalf of a profiled request begin with this prefix and the profile's marker
+PROFILED_THREAD_PREFIX = "profiled-"
+
+# Profiled requests run one at a time so their samples never mix
+_profile_lock = threading.Lock()
+# The marker of the profile being recorded in the current context, if any
+_profile_marker = contextvars.ContextVar("profile_marker", default=None)
+
+
+def profiling_requested():
+    """
+    Checks whether the current request asked to be profiled and is allowed to be.
+
+    Returns:
+        bool: True if the profile header or query flag is set by an allowlisted client.
+    """
+    header = request.headers.get(PROFILE_HEADER)
+    if (header is None or header == "0") and request.args.get("profile") != "1":
+        return False
+    allowlist = {address.strip() for address in os.getenv(PROFILE_ALLOWLIST_ENV, "").split(",") if address.strip()}
+    return request.remote_addr in allowlist
+
+
+def thread_name_prefix(name):
+    """
+    Builds the thread name prefix for a pool, marking its threads if they work for a profiled request.
+
+    Pools started while a request is profiled (on its thread or on a thread already marked)
+    get the profile's marker in their names, which is how its StackSampler recognizes them.
+
+    Args:
+        name: The pool's own name for its threads (e.g. "search").
+
+    Returns:
+        str: The prefix to pass as a ThreadPoolExecutor's thread_name_prefix.
+    """
+    marker = _profile_marker.get()
+    current = threading.current_thread().name
+    if marker is None and current.startswith(PROFILED_THREAD_PREFIX):
+        marker = current.partition("/")[0]
+    return f"{marker}/{name}" if marker else name
+
+
+class StackSampler:
+    """
+    Samples the stacks of a request's threads at a fixed interval on a background thread.
+
+    A request's work is spread over its own thread and the threads it starts (search pools,
+    upload threads), so the thread that enters the sampler is sampled along with every
+    thread named with the sampler's marker (see thread_name_prefix). Threads serving other
+    requests at the same time are left out. Samples are wall-clock, so time spent waiting
+    on the APIs shows up alongside time spent computing.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        """
+        Initializes a new StackSampler.
+
+        Args:
+            interval: The number of seconds between samples.
+        """
+        self._interval = interval
+        self._counts = collections.Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+        self._marker = f"{PROFILED_THREAD_PREFIX}{uuid.uuid4().hex[:12]}"
+        self._token = None
+        self._sampled = None
+
+    def __enter__(self):
+        self._sampled = threading.get_ident()
+        self._token = _profile_marker.set(self._marker)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stopped.set()
+        self._thread.join()
+        _profile_marker.reset(self._token)
+        return False
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != self._sampled and not names.get(ident, "").startswith(f"{self._marker}/"):
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self._counts[";".join(reversed(stack))] += 1
+
+    def dump(self, path):
+        """
+        Writes the samples in folded-stack format ("thread;outer;...;inner count" per line),
+        which flame graph tools such as speedscope and flamegraph.pl read directly.
+        """
+        with open(path, mode='w', encoding='utf-8') as file:
+            for stack, count in self._counts.most_common():
+                file.write(f"{stack} {count}\n")
+
+
+def profiled(view):
+    """
+    Decorates a Flask view so that individual requests can opt in to being profiled.
+
+    A profiled request runs its view under a StackSampler and writes the samples to
+    <profile dir>/<request ID>.folded, where the request ID is taken from an X-Request-ID
+    header or generated. The response carries the ID in its own X-Request-ID header.
+    Profiled requests are serialized, so one waits for another to finish first, and only
+    allowlisted clients can opt in (see profiling_requested). When a request does not opt in, the view is called directly, with no profiler involved.
+
+    Args:
+        view: The Flask view function to wrap.
+
+    Returns:
+        The wrapped view function.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not profiling_requested():
+            return view(*args, **kwargs)
+
+        request_id = request.headers.get("X-Request-ID", "")
+        if not _SAFE_REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        with _profile_lock:
+            sampler = StackSampler()
+            try:
+                with sampler:
+                    response = view(*args, **kwargs)
+            finally:
+                profile_dir = os.getenv(PROFILE_DIR_ENV, DEFAULT_PROFILE_DIR)
+                os.makedirs(profile_dir, exist_ok=True)
+                sampler.dump(os.path.join(profile_dir, f"{request_id}.folded"))
+
+        # Views return either a response or a (body, status) tuple
+        response = make_response(response)
+        response.headers["X-Request-ID"] = request_id
+        return response
+
+    return wrapper
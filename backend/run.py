@@ -1,8 +1,12 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 from converter import PlaylistConverter
 from generator import PlaylistGenerator
+from profiling import profiled
+import json
 import os
+import queue
+import threading
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # Optional: only needed if using sessions
@@ -12,53 +16,166 @@ CORS(app)  # Enable CORS for all routes
 playlist_generator = PlaylistGenerator()
 playlist_converter = PlaylistConverter()
 
+CONVERT_FIELDS = ['playlist_url', 'target_platform']
+GENERATE_FIELDS = [
+    'seed_playlist_id', 'seed_platform', 'target_platform', 'target_energy',
+    'target_valence', 'activity', 'environment', 'amount', 'playlist_name'
+]
+GENERATE_BATCH_FIELDS = ['seed_playlist_id', 'seed_platform', 'target_platform', 'profiles']
+
+
+def convert_args(data):
+    """
+    Maps a /convert request body onto PlaylistConverter.convert_playlist arguments.
+    """
+    return {
+        'source_url': data['playlist_url'],
+        'target_platform': data['target_platform'],
+        'sync': data.get('sync', False),
+    }
+
+
+def generate_args(data):
+    """
+    Maps a /generate request body onto PlaylistGenerator.generate_playlist_from_seed arguments.
+    """
+    return {
+        'seed_playlist_url': data['seed_playlist_id'],
+        'seed_platform': data['seed_platform'],
+        'target_platform': data['target_platform'],
+        'target_energy': data['target_energy'],
+        'target_valence': data['target_valence'],
+        'activity': data['activity'],
+        'environment': data['environment'],
+        'amount': data['amount'],
+        'playlist_name': data['playlist_name'],
+        'mode': data.get('mode', 'seed'),
+        'diversity': data.get('diversity', 0.0),
+        'max_per_artist': data.get('max_per_artist'),
+    }
+
+
+def sse_event(event, data):
+    """
+    Formats one Server-Sent Event.
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream_progress(work, kwargs):
+    """
+    Runs a conversion or generation on a background thread and streams its progress as Server-Sent Events.
+
+    Every progress event is forwarded as it happens. The stream ends with a "done" event
+    carrying the playlist URL, or an "error" event if the work raised.
+
+    Args:
+        work: The function to run; it must accept a progress keyword argument.
+        kwargs: The other keyword arguments for work.
+
+    Returns:
+        A streaming text/event-stream response.
+    """
+    events = queue.Queue()
+    finished = object()
+
+    def run():
+        try:
+            url = work(**kwargs, progress=lambda event, data: events.put((event, data)))
+            events.put(('done', {'url': url}))
+        except Exception as e:
+            events.put(('error', {'error': str(e)}))
+        events.put(finished)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    def stream():
+        while True:
+            item = events.get()
+            if item is finished:
+                return
+            yield sse_event(*item)
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
 @app.route('/')
 def home():
     return jsonify({'message': 'Welcome to the MoodTune API'}), 200
 
 @app.route('/convert', methods=['POST'])
+@profiled
 def convert_playlist():
     data = request.get_json()
 
     # Validate required fields
-    if not all(key in data for key in ['playlist_url', 'target_platform']):
+    if not all(key in data for key in CONVERT_FIELDS):
         return jsonify({'error': 'Missing required fields'}), 400
 
     try:
-        converted_url = playlist_converter.convert_playlist(
-            source_url=data['playlist_url'],
-            target_platform=data['target_platform']
-        )
+        converted_url = playlist_converter.convert_playlist(**convert_args(data))
         print(converted_url)
         return jsonify({'url': converted_url}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@app.route('/convert/stream', methods=['POST'])
+def convert_playlist_stream():
+    data = request.get_json()
+
+    # Validate required fields
+    if not all(key in data for key in CONVERT_FIELDS):
+        return jsonify({'error': 'Missing required fields'}), 400
+
+    return stream_progress(playlist_converter.convert_playlist, convert_args(data))
+
 @app.route('/generate', methods=['POST'])
+@profiled
 def generate_playlist():
     data = request.get_json()
 
     # Validate required fields
-    required_fields = [
-        'seed_playlist_id', 'seed_platform', 'target_platform', 'target_energy',
-        'target_valence', 'activity', 'environment', 'amount', 'playlist_name'
-    ]
-    if not all(key in data for key in required_fields):
+    if not all(key in data for key in GENERATE_FIELDS):
+        return jsonify({'error': 'Missing required fields'}), 400
+
+    try:
+        playlist_url = playlist_generator.generate_playlist_from_seed(**generate_args(data))
+        return jsonify({'url': playlist_url}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/generate/stream', methods=['POST'])
+def generate_playlist_stream():
+    data = request.get_json()
+
+    # Validate required fields
+    if not all(key in data for key in GENERATE_FIELDS):
+        return jsonify({'error': 'Missing required fields'}), 400
+
+    return stream_progress(playlist_generator.generate_playlist_from_seed, generate_args(data))
+
+@app.route('/generate/batch', methods=['POST'])
+def generate_playlists():
+    data = request.get_json()
+
+    # Validate required fields
+    if not all(key in data for key in GENERATE_BATCH_FIELDS):
         return jsonify({'error': 'Missing required fields'}), 400
 
     try:
-        playlist_url = playlist_generator.generate_playlist_from_seed(
-            seed_playlist_id=data['seed_playlist_id'],
+        results = playlist_generator.generate_playlists_from_seed(
+            seed_playlist_url=data['seed_playlist_id'],
             seed_platform=data['seed_platform'],
             target_platform=data['target_platform'],
-            target_energy=data['target_energy'],
-            target_valence=data['target_valence'],
-            activity=data['activity'],
-            environment=data['environment'],
-            amount=data['amount'],
-            playlist_name=data['playlist_name']
+            profiles=data['profiles'],
+            mode=data.get('mode', 'seed'),
+            create_playlists=data.get('create_playlists', False)
         )
-        return jsonify({'url': playlist_url}), 200
+        return jsonify({'results': results}), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
@@ -0,0 +1,259 @@
+import random
+import re
+import threading
+import time
+import requests
+
+# Requests per second and burst size allowed by each API's token bucket
+API_LIMITS = {
+    "spotify": (10.0, 20),
+    "youtube": (5.0, 10),
+}
+DEFAULT_LIMIT = (5.0, 10)
+
+# Bounds for the adaptive number of requests in flight per API
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 16
+
+# Statuses worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+_HTTP_STATUS = re.compile(r"HTTP (\d{3})")
+
+
+class RetryableResponseError(RuntimeError):
+    """
+    Raised from inside a scheduled call when the API answered but reported a transient failure in the response body.
+
+    The scheduler retries it like a retryable HTTP error, but does not take it as a sign of overload.
+    """
+
+
+class RequestScheduler:
+    """
+    Paces and retries outbound calls to one API so that bursts of work stay within its rate limits.
+
+    Every call first takes a token from a token bucket refilled at the API's request rate,
+    then waits for a free concurrency slot. The number of slots adapts to the API's
+    responses (AIMD): each success adds 1/limit slots, so the limit grows by about one per
+    round of requests, and each sign of overload (a 429, a retryable 5xx, a timeout, or a
+    connection error) halves it. Other failures leave it unchanged. A Retry-After from the API
+    pauses the whole bucket, and retryable failures are retried with jittered exponential
+    backoff.
+
+    Attributes:
+        name (str): The name of the API the scheduler paces.
+    """
+
+    def __init__(self, name, rate, burst, max_retries=5, backoff=0.5, max_backoff=30.0):
+        """
+        Initializes a new RequestScheduler.
+
+        Args:
+            name: The name of the API the scheduler paces.
+            rate: The number of tokens (requests) added to the bucket per second.
+            burst: The maximum number of tokens the bucket holds.
+            max_retries: How many times a retryable failure is retried before it is raised.
+            backoff: The base delay in seconds for exponential backoff.
+            max_backoff: The longest delay in seconds between two attempts.
+        """
+        self.name = name
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._limit = float(MAX_CONCURRENCY) / 2
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def concurrency(self):
+        """
+        The number of requests currently allowed in flight at once.
+        """
+        return int(self._limit)
+
+    def call(self, function, *args, **kwargs):
+        """
+        Calls a function that makes one request, pacing it and retrying retryable failures.
+
+        Args:
+            function: The callable that makes the request.
+            *args: Positional arguments for function.
+            **kwargs: Keyword arguments for function.
+
+        Returns:
+            Any: The return value of function.
+
+        Raises:
+            Exception: The last error raised by function if it is not retryable or every retry fails.
+        """
+        for attempt in range(self._max_retries + 1):
+            self._acquire()
+            try:
+                result = function(*args, **kwargs)
+            except Exception as e:
+                status, retry_after = _error_status(e)
+                overloaded = status in RETRYABLE_STATUSES or isinstance(e, (requests.ConnectionError, requests.Timeout))
+                retryable = overloaded or isinstance(e, RetryableResponseError)
+                # No failure grows the limit, and failures of the transport or server shrink it
+                self._release(succeeded=False, overloaded=overloaded)
+                if not retryable or attempt == self._max_retries:
+                    raise
+
+                delay = min(self._max_backoff, random.uniform(0, self._backoff * (2 ** attempt)))
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                    self._pause(retry_after)
+                time.sleep(delay)
+            else:
+                self._release(succeeded=True)
+                return result
+
+    def _acquire(self):
+        """
+        Blocks until a token and a concurrency slot are available, then takes both.
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+                self._refilled_at = now
+
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._in_flight >= int(self._limit):
+                    wait = None  # Woken by _release
+                elif self._tokens < 1:
+                    wait = (1 - self._tokens) / self._rate
+                else:
+                    self._tokens -= 1
+                    self._in_flight += 1
+                    return
+                self._condition.wait(wait)
+
+    def _release(self, succeeded, overloaded=False):
+        """
+        Frees a concurrency slot and adapts the concurrency limit to the outcome of the call.
+
+        Args:
+            succeeded: Whether the call succeeded, which grows the limit.
+            overloaded: Whether the call failed in a way that suggests overload, which halves the limit.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if overloaded:
+                self._limit = max(MIN_CONCURRENCY, self._limit / 2)
+            elif succeeded:
+                self._limit = min(MAX_CONCURRENCY, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def _pause(self, seconds):
+        """
+        Stops handing out tokens for a number of seconds, as requested by a Retry-After.
+        """
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0
+
+
+class ScheduledClient:
+    """
+    Wraps an API client so that every method call goes through a RequestScheduler.
+
+    Non-callable attributes are passed through unchanged.
+    """
+
+    def __init__(self, client, scheduler):
+        """
+        Initializes a new ScheduledClient.
+
+        Args:
+            client: The API client to wrap (e.g. a spotipy.Spotify or YTMusic instance).
+            scheduler: The RequestScheduler for the client's API.
+        """
+        self._client = client
+        self._scheduler = scheduler
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if not callable(attribute):
+            return attribute
+
+        def scheduled(*args, **kwargs):
+            return self._scheduler.call(attribute, *args, **kwargs)
+
+        return scheduled
+
+
+def scheduled_call(client, function, *args, **kwargs):
+    """
+    Calls function(client, *args, **kwargs) as a single scheduled request of a client.
+
+    Checks that function makes on the response run inside the scheduled call, so raising
+    RetryableResponseError from them retries the request. A ScheduledClient's underlying
+    client is passed to function; any other client is called directly.
+
+    Args:
+        client: The client to make the request with, usually a ScheduledClient.
+        function: The callable that makes the request with the client and checks its response.
+        *args: Further positional arguments for function.
+        **kwargs: Keyword arguments for function.
+
+    Returns:
+        Any: The return value of function.
+    """
+    if isinstance(client, ScheduledClient):
+        return client._scheduler.call(function, client._client, *args, **kwargs)
+    return function(client, *args, **kwargs)
+
+
+def _error_status(error):
+    """
+    Extracts the HTTP status and any Retry-After delay (in seconds) from an API client error.
+
+    Returns:
+        tuple: The status code (or None if the error carries none) and the Retry-After delay (or None).
+    """
+    status = getattr(error, "http_status", None)
+    headers = getattr(error, "headers", None) or {}
+    response = getattr(error, "response", None)
+    if status is None and response is not None:
+        status = getattr(response, "status_code", None)
+        headers = getattr(response, "headers", None) or headers
+    if status is None:
+        # ytmusicapi only reports the status in its message
+        match = _HTTP_STATUS.search(str(error))
+        status = int(match.group(1)) if match else None
+
+    retry_after = headers.get("Retry-After") if hasattr(headers, "get") else None
+    try:
+        retry_after = float(retry_after) if retry_after is not None else None
+    except ValueError:
+        retry_after = None
+    return status, retry_after
+
+
+_schedulers = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_scheduler(api):
+    """
+    Returns the process-wide RequestScheduler for an API, creating it on first use.
+
+    Args:
+        api: The API name ("spotify" or "youtube").
+
+    Returns:
+        RequestScheduler: The shared scheduler, used by every client of that API.
+    """
+    with _schedulers_lock:
+        if api not in _schedulers:
+            rate, burst = API_LIMITS.get(api, DEFAULT_LIMIT)
+            _schedulers[api] = RequestScheduler(api, rate, burst)
+        return _schedulers[api]
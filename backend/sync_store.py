@@ -0,0 +1,122 @@
+import contextlib
+import hashlib
+import json
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows, where the store is only coordinated within a process
+    fcntl = None
+
+# Where sync state is kept between runs
+DEFAULT_SYNC_FILE = os.path.join(os.path.dirname(__file__), "config", "sync_state.json")
+
+
+class SyncStore:
+    """
+    Persists the state of synced playlists in a JSON file shared by every process.
+
+    Each entry is keyed by source playlist and target platform, and records the target
+    playlist, the source track IDs as of the last sync, and how each source track resolved
+    on the target platform.
+
+    The file is the only copy of the state: every get re-reads it under a shared file lock,
+    and every put rewrites a single entry under an exclusive one, so processes never
+    overwrite each other's entries. lock() serializes whole syncs of one key.
+    """
+
+    def __init__(self, path=DEFAULT_SYNC_FILE):
+        """
+        Initializes a SyncStore.
+
+        Args:
+            path: The path of the JSON file holding the sync state.
+        """
+        self._path = path
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key):
+        """
+        Returns the stored state for a sync key, or None if the playlist has not been synced.
+
+        Args:
+            key: The sync key (see sync_key).
+
+        Returns:
+            dict or None: A fresh copy of the target_id, target_url, tracks, and resolutions of
+            the last sync, which the caller may modify freely.
+        """
+        with _file_lock(f"{self._path}.lock", exclusive=False):
+            return self._read().get(key)
+
+    def put(self, key, state):
+        """
+        Stores the state for a sync key, leaving every other entry as it is on disk.
+
+        The file is re-read, updated, written to a temporary path, and then moved into place,
+        all under an exclusive lock, so an interrupted or concurrent write never loses entries
+        or leaves a corrupt store behind.
+
+        Args:
+            key: The sync key (see sync_key).
+            state (dict): The target_id, target_url, tracks, and resolutions to store.
+        """
+        with self._lock, _file_lock(f"{self._path}.lock", exclusive=True):
+            entries = self._read()
+            entries[key] = state
+            tmp_path = f"{self._path}.tmp-{os.getpid()}"
+            with open(tmp_path, mode='w', encoding='utf-8') as file:
+                json.dump(entries, file)
+            os.replace(tmp_path, self._path)
+
+    @contextlib.contextmanager
+    def lock(self, key):
+        """
+        Holds a lock for one sync key, across threads and processes, for the length of a sync.
+
+        Two syncs of the same playlist therefore never both create a target playlist or
+        overwrite each other's state, while syncs of different playlists run in parallel.
+
+        Args:
+            key: The sync key (see sync_key).
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        with key_lock, _file_lock(os.path.join(f"{self._path}.locks", f"{digest}.lock"), exclusive=True):
+            yield
+
+    def _read(self):
+        """
+        Reads every entry from the file, or returns no entries if it does not exist yet.
+        """
+        if not os.path.isfile(self._path):
+            return {}
+        with open(self._path, mode='r', encoding='utf-8') as file:
+            return json.load(file)
+
+
+@contextlib.contextmanager
+def _file_lock(lock_path, exclusive):
+    """
+    Holds an flock on a lock file, shared or exclusive; a no-op where fcntl is unavailable.
+    """
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(lock_path)), exist_ok=True)
+    with open(lock_path, mode='a') as file:
+        fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def sync_key(source_platform, playlist_id, target_platform):
+    """
+    Builds the key under which a source playlist's sync to a target platform is stored.
+    """
+    return f"{source_platform}:{playlist_id}->{target_platform}"
@@ -0,0 +1,101 @@
+import random
+
+import numpy as np
+
+from feature_store import FEATURE_COLUMNS, FeatureStore, decode_ids, encode_ids
+
+BASE62 = "0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def to_base62(value):
+    digits = []
+    for _ in range(22):
+        value, digit = divmod(value, 62)
+        digits.append(BASE62[digit])
+    return "".join(reversed(digits))
+
+
+def from_base62(track_id):
+    value = 0
+    for char in track_id:
+        value = value * 62 + BASE62.index(char)
+    return value
+
+
+def random_ids(count, seed=0):
+    rng = random.Random(seed)
+    return [to_base62(rng.getrandbits(128)) for _ in range(count)]
+
+
+# Fixture IDs start with "0" to stay below 2^128
+def artist(n):
+    return f"0artist{n:015d}"
+
+
+def album(n):
+    return f"0album{n:016d}"
+
+
+def track(n):
+    return f"0track{n:016d}"
+
+
+def test_encode_decode_round_trip():
+    ids = random_ids(500) + [to_base62(0), to_base62(2 ** 128 - 1), "0TnOYISbd1XYRBk9myaseg"]
+    keys, valid = encode_ids(ids)
+    assert keys.dtype == np.dtype("S16")
+    assert valid.all()
+    assert decode_ids(keys) == ids
+
+
+def test_encoded_byte_order_matches_numeric_order():
+    ids = random_ids(500, seed=1)
+    keys, _ = encode_ids(ids)
+    for track_id, key in zip(ids, keys):
+        assert int.from_bytes(key.ljust(16, b"\0"), "big") == from_base62(track_id)
+    assert [ids[i] for i in np.argsort(keys)] == sorted(ids, key=from_base62)
+
+
+def test_invalid_ids_are_flagged_and_packed_as_zero():
+    keys, valid = encode_ids(["short", "0TnOYISbd1XYRBk9myase!", "0TnOYISbd1XYRBk9myaseg0", "", None])
+    assert not valid.any()
+    assert (keys == b"").all()
+
+
+def test_ids_above_128_bits_are_invalid():
+    # 62^22 exceeds 2^128, so the largest base62 strings do not fit
+    keys, valid = encode_ids(["Z" * 22, to_base62(2 ** 128), to_base62(2 ** 128 - 1)])
+    assert valid.tolist() == [False, False, True]
+    assert (keys[:2] == b"").all()
+
+
+def test_from_csv_rows_features_and_expand(tmp_path):
+    csv_file = tmp_path / "tracks.csv"
+    rows = [
+        ("id", "name", "artist_ids", "album_id", *FEATURE_COLUMNS),
+        (track(3), "c", f"['{artist(1)}', '{artist(2)}']", album(1), "0.3", "0.1", "0.5", "-10.0"),
+        (track(1), "a", f"['{artist(2)}']", album(2), "0.9", "0.2", "0.6", "-5.5"),
+        (track(2), "b", "[]", album(1), "0.1", "1.0", "0.7", "-20.25"),
+        ("not an id", "x", f"['{artist(1)}']", album(3), "0.5", "0.5", "0.5", "-1.0"),
+        (track(4), "bad", f"['{artist(3)}']", album(3), "loud", "0.5", "0.5", "-1.0"),
+    ]
+    csv_file.write_text("\n".join(",".join(f'"{field}"' for field in row) for row in rows) + "\n")
+
+    store = FeatureStore.from_csv(str(csv_file), workers=1)
+    assert len(store) == 3
+    positions = store.rows([track(1), track(2), track(3), track(4), "missing"])
+    assert positions.tolist()[3:] == [-1, -1]
+    assert store.track_ids(positions[:3]) == [track(1), track(2), track(3)]
+
+    # Quantized features stay within half a step of the CSV values
+    expected = np.array([[0.9, 0.2, 0.6, -5.5], [0.1, 1.0, 0.7, -20.25], [0.3, 0.1, 0.5, -10.0]])
+    step = (expected.max(axis=0) - expected.min(axis=0)) / 65535
+    assert (np.abs(store.features(positions[:3]) - expected) <= step / 2 + 1e-12).all()
+
+    row_of = dict(zip((track(1), track(2), track(3)), positions[:3].tolist()))
+    assert store.expand(artist_ids=[artist(1)]).tolist() == [row_of[track(3)]]
+    assert store.expand(artist_ids=[artist(2)]).tolist() == sorted([row_of[track(1)], row_of[track(3)]])
+    assert store.expand(album_ids=[album(1)], artist_ids=[artist(2)]).tolist() == [0, 1, 2]
+    assert store.expand(artist_ids=[artist(3)], album_ids=[album(3)]).size == 0
+    primary = store.primary_artists(positions[:3])
+    assert primary[1] == -1 and primary[0] != primary[2]
@@ -0,0 +1,82 @@
+from data_structures import LinkedList
+
+
+def values(linked_list):
+    """
+    Returns the list's values walking forwards, checking that walking backwards from the tail agrees.
+    """
+    forwards = list(linked_list)
+    backwards = []
+    node = linked_list.tail
+    while node is not None:
+        backwards.append(node.value)
+        node = node.prev
+    assert backwards == forwards[::-1]
+    assert len(linked_list) == len(forwards)
+    return forwards
+
+
+def test_unlink_single_node():
+    linked_list = LinkedList()
+    node = linked_list.append(1)
+    linked_list.unlink(node)
+    assert linked_list.head is None and linked_list.tail is None
+    assert values(linked_list) == []
+    assert node.prev is None and node.next is None
+
+
+def test_unlink_head_middle_and_tail():
+    linked_list = LinkedList()
+    nodes = [linked_list.append(value) for value in range(5)]
+    linked_list.unlink(nodes[0])
+    assert linked_list.head is nodes[1]
+    linked_list.unlink(nodes[4])
+    assert linked_list.tail is nodes[3]
+    linked_list.unlink(nodes[2])
+    assert values(linked_list) == [1, 3]
+
+
+def test_move_to_end():
+    linked_list = LinkedList()
+    nodes = [linked_list.append(value) for value in range(3)]
+    linked_list.move_to_end(nodes[0])
+    assert values(linked_list) == [1, 2, 0]
+    linked_list.move_to_end(nodes[2])
+    assert values(linked_list) == [1, 0, 2]
+    # Moving the tail is a no-op
+    linked_list.move_to_end(nodes[2])
+    assert values(linked_list) == [1, 0, 2]
+    assert linked_list.head is nodes[1] and linked_list.tail is nodes[2]
+
+
+def test_move_to_end_single_node():
+    linked_list = LinkedList()
+    node = linked_list.append(1)
+    linked_list.move_to_end(node)
+    assert linked_list.head is node and linked_list.tail is node
+    assert values(linked_list) == [1]
+
+
+def test_pop_and_pop_back():
+    linked_list = LinkedList()
+    assert linked_list.pop() is None
+    assert linked_list.pop_back() is None
+    for value in range(3):
+        linked_list.append(value)
+    assert linked_list.pop_back() == 2
+    assert linked_list.pop() == 0
+    assert values(linked_list) == [1]
+    assert linked_list.pop_back() == 1
+    assert linked_list.head is None and linked_list.tail is None
+    assert values(linked_list) == []
+
+
+def test_append_to_front_and_delete():
+    linked_list = LinkedList()
+    linked_list.append(2)
+    linked_list.append_to_front(1)
+    linked_list.append(3)
+    linked_list.delete(3)
+    assert values(linked_list) == [1, 2]
+    linked_list.delete(99)
+    assert values(linked_list) == [1, 2]
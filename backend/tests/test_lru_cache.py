@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+
+from data_structures import LRUCache
+
+
+def test_rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        LRUCache(0)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    # Reading "a" makes "b" the least recently used
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert "b" not in cache
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_put_existing_key_updates_and_refreshes():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = LRUCache(10, ttl=5)
+    cache.put("a", 1)
+    now[0] += 4.9
+    assert cache.get("a") == 1
+    now[0] += 0.1
+    assert "a" not in cache
+    assert cache.get("a", "gone") == "gone"
+    # The expired entry is dropped on lookup, and does not count as an eviction
+    assert len(cache) == 0
+    assert cache.evictions == 0
+
+
+def test_stats_count_hits_misses_and_evictions():
+    cache = LRUCache(1)
+    cache.get("a")
+    cache.put("a", 1)
+    cache.get("a")
+    cache.put("b", 2)
+    cache.get("a")
+    # Membership checks are not counted as uses
+    assert "b" in cache
+    assert cache.stats() == {"size": 1, "max_size": 1, "hits": 1, "misses": 2, "evictions": 1}
+
+
+def test_delete_and_clear():
+    cache = LRUCache(3)
+    for key in "abc":
+        cache.put(key, key)
+    cache.delete("b")
+    cache.delete("missing")
+    assert "b" not in cache and len(cache) == 2
+    cache.clear()
+    assert len(cache) == 0 and "a" not in cache
+    cache.put("d", 4)
+    assert cache.get("d") == 4
+
+
+def test_concurrent_put_and_get():
+    cache = LRUCache(50)
+    errors = []
+
+    def work(worker):
+        try:
+            for i in range(2000):
+                key = (worker * 7 + i) % 100
+                cache.put(key, key)
+                value = cache.get(key)
+                assert value is None or value == key
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(cache) == 50
+    # The recency list and the key lookup still agree
+    assert len(cache._order) == 50
+    assert sorted(key for key, _, _ in cache._order) == sorted(cache._nodes)
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+    assert stats["evictions"] > 0
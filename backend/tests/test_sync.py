@@ -0,0 +1,260 @@
+import threading
+import time
+
+import pytest
+
+from bulk_writer import BulkWriteError
+from converter import PlaylistConverter
+from data_structures import LRUCache
+from scheduler import RequestScheduler, ScheduledClient
+from sync_store import SyncStore
+
+SPOTIFY_SOURCE = "https://open.spotify.com/playlist/abc"
+YOUTUBE_SOURCE = "https://music.youtube.com/playlist?list=SRC"
+
+
+class FakeSpotify:
+    """A Spotify client holding a source playlist and the playlists it creates; queries containing "miss" find nothing."""
+
+    def __init__(self):
+        self.source = []
+        self.playlists = {}
+        self.searches = 0
+        self.fail_adds = 0
+        self.fail_removals = 0
+
+    def playlist_tracks(self, playlist_id):
+        return {"items": [{"track": {"id": track_id, "name": name, "artists": [{"name": "a"}]}}
+                          for track_id, name in self.source], "next": None}
+
+    def search(self, q, type, limit):
+        self.searches += 1
+        if "miss" in q:
+            return {"tracks": {"items": []}}
+        name = q.split()[0]
+        return {"tracks": {"items": [{"id": name, "uri": f"spotify:track:{name}", "name": name,
+                                      "artists": [{"id": None, "name": "a"}], "album": {}}]}}
+
+    def user_playlist_create(self, user, name, public):
+        playlist_id = f"P{len(self.playlists)}"
+        self.playlists[playlist_id] = []
+        return {"id": playlist_id, "external_urls": {"spotify": f"https://open.spotify.com/playlist/{playlist_id}"}}
+
+    def user_playlist_add_tracks(self, user, playlist_id, tracks):
+        if self.fail_adds:
+            self.fail_adds -= 1
+            raise RuntimeError("add failed")
+        self.playlists[playlist_id] += tracks
+
+    def playlist_remove_all_occurrences_of_items(self, playlist_id, items):
+        if self.fail_removals:
+            self.fail_removals -= 1
+            raise RuntimeError("remove failed")
+        self.playlists[playlist_id] = [uri for uri in self.playlists[playlist_id] if uri not in items]
+
+
+class FakeYTMusic:
+    """A YouTube Music client holding a source playlist and the playlists it creates; queries containing "miss" find nothing."""
+
+    def __init__(self):
+        self.source = []
+        self.playlists = {}
+        self.searches = 0
+        self.fail_searches = set()
+        self._set_ids = 0
+
+    def get_playlist(self, playlist_id, limit):
+        if playlist_id == "SRC":
+            return {"tracks": [{"videoId": video_id, "title": title, "artists": [{"name": "a"}]}
+                               for video_id, title in self.source]}
+        return {"tracks": [{"videoId": video_id, "setVideoId": set_id} for video_id, set_id in self.playlists[playlist_id]]}
+
+    def search(self, query, filter, limit):
+        self.searches += 1
+        name = query.split()[0]
+        if name in self.fail_searches:
+            raise RuntimeError("search failed")
+        return [] if "miss" in query else [{"videoId": f"v{name}"}]
+
+    def _entries(self, video_ids):
+        entries = []
+        for video_id in video_ids:
+            self._set_ids += 1
+            entries.append((video_id, f"s{self._set_ids}"))
+        return entries
+
+    def create_playlist(self, title, description, video_ids, privacy_status):
+        playlist_id = f"Y{len(self.playlists)}"
+        self.playlists[playlist_id] = self._entries(video_ids)
+        return playlist_id
+
+    def add_playlist_items(self, playlist_id, videoIds, duplicates):
+        self.playlists[playlist_id] += self._entries(videoIds)
+        return {"status": "STATUS_SUCCEEDED"}
+
+    def remove_playlist_items(self, playlist_id, videos):
+        set_ids = {video["setVideoId"] for video in videos}
+        self.playlists[playlist_id] = [entry for entry in self.playlists[playlist_id] if entry[1] not in set_ids]
+
+
+def make_converter(store_path):
+    converter = PlaylistConverter.__new__(PlaylistConverter)
+    converter._spotify = FakeSpotify()
+    converter._ytmusic = FakeYTMusic()
+    converter._spotify_username = "me"
+    converter._search_cache = LRUCache(1000)
+    converter._sync_store = SyncStore(str(store_path))
+    return converter
+
+
+def youtube_videos(converter, playlist_id="Y0"):
+    return [video_id for video_id, _ in converter._ytmusic.playlists[playlist_id]]
+
+
+@pytest.fixture
+def converter(tmp_path):
+    return make_converter(tmp_path / "sync_state.json")
+
+
+def test_first_sync_converts_whole_playlist(converter):
+    converter._spotify.source = [(f"id{i}", f"t{i}") for i in range(5)] + [("idm", "miss")]
+    url = converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert url.endswith("list=Y0")
+    assert youtube_videos(converter) == [f"vt{i}" for i in range(5)]
+    assert converter._ytmusic.searches == 6
+
+
+def test_resync_only_searches_and_writes_changes(converter):
+    converter._spotify.source = [(f"id{i}", f"t{i}") for i in range(5)] + [("idm", "miss")]
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+
+    converter._spotify.source = converter._spotify.source[2:] + [("new", "n1")]
+    events = []
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube", progress=lambda event, data: events.append((event, data)))
+    # Only the added track is searched; the unmatched one is not searched again
+    assert converter._ytmusic.searches == 7
+    assert youtube_videos(converter) == ["vt2", "vt3", "vt4", "vn1"]
+    assert ("removed", {"count": 2}) in events
+    assert list(converter._ytmusic.playlists) == ["Y0"]
+
+
+def test_resync_from_fresh_store_uses_saved_state(converter, tmp_path):
+    converter._spotify.source = [(f"id{i}", f"t{i}") for i in range(3)]
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    converter._sync_store = SyncStore(str(tmp_path / "sync_state.json"))
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert converter._ytmusic.searches == 3
+    assert youtube_videos(converter) == ["vt0", "vt1", "vt2"]
+
+
+def test_target_track_kept_while_another_source_track_resolves_to_it(converter):
+    converter._spotify.source = [("id1", "t1"), ("id2", "t1")]
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    converter._spotify.source = [("id2", "t1")]
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert youtube_videos(converter) == ["vt1", "vt1"]
+
+
+def test_failed_search_is_retried_by_next_sync(converter):
+    converter._spotify.source = [("id1", "t1"), ("id2", "t2")]
+    converter._ytmusic.fail_searches = {"t2"}
+    with pytest.raises(BulkWriteError):
+        converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert youtube_videos(converter) == ["vt1"]
+
+    converter._ytmusic.fail_searches = set()
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert youtube_videos(converter) == ["vt1", "vt2"]
+
+
+def test_failed_add_is_retried_by_next_sync(converter):
+    converter._ytmusic.source = [("v1", "y1")]
+    converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    converter._ytmusic.source.append(("v2", "y2"))
+    converter._spotify.fail_adds = 1
+    with pytest.raises(BulkWriteError):
+        converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    assert converter._spotify.playlists["P0"] == ["spotify:track:y1"]
+
+    converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    assert converter._spotify.playlists["P0"] == ["spotify:track:y1", "spotify:track:y2"]
+    assert converter._spotify.searches == 2
+
+
+def test_failed_removal_is_retried_by_next_sync(converter):
+    converter._ytmusic.source = [("v1", "y1"), ("v2", "y2")]
+    converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    converter._ytmusic.source = [("v1", "y1")]
+    converter._spotify.fail_removals = 1
+    with pytest.raises(BulkWriteError):
+        converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    assert converter._spotify.playlists["P0"] == ["spotify:track:y1", "spotify:track:y2"]
+
+    converter.sync_playlist(YOUTUBE_SOURCE, "spotify")
+    assert converter._spotify.playlists["P0"] == ["spotify:track:y1"]
+
+
+def test_stores_sharing_a_file_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / "sync_state.json")
+    first, second = SyncStore(path), SyncStore(path)
+    first.put("a", {"tracks": ["1"]})
+    second.put("b", {"tracks": ["2"]})
+    assert first.get("b") == {"tracks": ["2"]}
+    assert second.get("a") == {"tracks": ["1"]}
+
+    # Entries handed out are copies, not the stored state
+    first.get("a")["tracks"].append("x")
+    assert first.get("a") == {"tracks": ["1"]}
+
+
+def test_concurrent_first_syncs_create_one_playlist(tmp_path):
+    converters = [make_converter(tmp_path / "sync_state.json") for _ in range(2)]
+    spotify = converters[0]._spotify
+    create = spotify.user_playlist_create
+
+    def slow_create(user, name, public):
+        # Without the sync lock, the other sync would also find no target playlist meanwhile
+        time.sleep(0.2)
+        return create(user, name, public)
+
+    spotify.user_playlist_create = slow_create
+    urls = []
+    for converter in converters:
+        converter._spotify = spotify
+        converter._ytmusic.source = [("v1", "y1")]
+    threads = [threading.Thread(target=lambda c=c: urls.append(c.sync_playlist(YOUTUBE_SOURCE, "spotify")))
+               for c in converters]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(spotify.playlists) == 1
+    assert urls[0] == urls[1]
+    assert spotify.playlists["P0"] == ["spotify:track:y1"]
+
+
+def test_youtube_failures_reported_in_response_are_retried(converter):
+    ytmusic = converter._ytmusic
+    converter._ytmusic = ScheduledClient(ytmusic, RequestScheduler("youtube", 1000, 1000, backoff=0))
+    create, add = ytmusic.create_playlist, ytmusic.add_playlist_items
+    failures = {"create": 1, "add": 1}
+
+    def flaky_create(**kwargs):
+        if failures["create"]:
+            failures["create"] -= 1
+            return {"error": "try again"}
+        return create(**kwargs)
+
+    def flaky_add(playlist_id, videoIds, duplicates):
+        if failures["add"]:
+            failures["add"] -= 1
+            return {"status": "STATUS_FAILED"}
+        return add(playlist_id, videoIds, duplicates)
+
+    ytmusic.create_playlist, ytmusic.add_playlist_items = flaky_create, flaky_add
+    converter._spotify.source = [("id1", "t1")]
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    converter._spotify.source.append(("id2", "t2"))
+    converter.sync_playlist(SPOTIFY_SOURCE, "youtube")
+    assert [video_id for video_id, _ in ytmusic.playlists["Y0"]] == ["vt1", "vt2"]
+    assert failures == {"create": 0, "add": 0}